@@ -11,6 +11,7 @@ import hashlib
 from typing import List, Dict, Any, Optional
 import numpy as np
 from llama_index.core import VectorStoreIndex, Document, Settings
+from llama_index.core.schema import MetadataMode
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.llms.openai import OpenAI
 from llama_index.vector_stores.redis import RedisVectorStore
@@ -135,12 +136,17 @@ class RedisVectorService:
         
         return VectorStoreIndex.from_vector_store(vector_store)
     
-    async def index_documents(self, event_id: str, document_type: str, documents: List[Document]) -> Dict[str, Any]:
-        """Add documents to the event index."""
+    async def index_documents(
+        self,
+        event_id: str,
+        document_type: str,
+        documents: List[Document],
+        batch_size: int = 32
+    ) -> Dict[str, Any]:
+        """Add documents to the event index, embedding and storing them batch_size nodes at a time."""
         try:
             index = await self.create_event_index(event_id, document_type)
             
-            # Insert documents
             for doc in documents:
                 # Ensure document has required metadata
                 if not doc.metadata:
@@ -149,14 +155,27 @@ class RedisVectorService:
                     "event_id": event_id,
                     "document_type": document_type
                 })
-                
-                index.insert(doc)
             
-            logger.info(f"Indexed {len(documents)} documents for event {event_id}, type {document_type}")
+            # One embedding request and one vector store write per batch,
+            # instead of a round trip for every document
+            nodes = Settings.node_parser.get_nodes_from_documents(documents)
+            for start in range(0, len(nodes), batch_size):
+                batch = nodes[start:start + batch_size]
+                embeddings = Settings.embed_model.get_text_embedding_batch(
+                    [node.get_content(metadata_mode=MetadataMode.EMBED) for node in batch],
+                    show_progress=False
+                )
+                for node, embedding in zip(batch, embeddings):
+                    node.embedding = embedding
+                index.insert_nodes(batch)
+            
+            logger.info(f"Indexed {len(documents)} documents ({len(nodes)} nodes) for event {event_id}, type {document_type}")
             
             return {
                 "success": True,
                 "indexed_count": len(documents),
+                "batched": True,
+                "batch_size": batch_size,
                 "event_id": event_id,
                 "document_type": document_type
             }
@@ -12,7 +12,7 @@ import asyncio
 import uuid
 import os
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta, timezone
 
 import redis.asyncio as redis
@@ -57,25 +57,32 @@ class GladiaMCPHandler:
             self.redis_client = redis.from_url(redis_url, decode_responses=True)
         return self.redis_client
     
-    async def _find_session_key(self, session_id: str) -> Optional[str]:
-        """Find the Redis key for a session by scanning all events."""
+    async def _find_session(self, session_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """Find a session's Redis key and stored JSON, or (None, None) if it is missing."""
         redis_client = await self.get_redis()
         
-        # Try common patterns first for efficiency
-        # Check if we have the session in active_sessions (contains event_id)
+        # Sessions started by this handler know their event, so GET the
+        # composite key directly instead of scanning the whole keyspace
         if session_id in self.active_sessions:
             event_id = self.active_sessions[session_id]["event_id"]
             test_key = f"event:{event_id}:session:{session_id}"
-            if await redis_client.exists(test_key):
-                return test_key
+            session_json = await redis_client.get(test_key)
+            if session_json:
+                return test_key, session_json
         
         # Fall back to scanning all events
         async for key in redis_client.scan_iter(match="event:*:session:*"):
             if f":session:{session_id}" in key:
-                if await redis_client.exists(key):
-                    return key
+                session_json = await redis_client.get(key)
+                if session_json:
+                    return key, session_json
         
-        return None
+        return None, None
+    
+    async def _find_session_key(self, session_id: str) -> Optional[str]:
+        """Find the Redis key for a session by scanning all events."""
+        session_key, _ = await self._find_session(session_id)
+        return session_key
     
     async def start_pitch_recording(
         self, 
@@ -308,20 +315,12 @@ class GladiaMCPHandler:
             # Get session from Redis - need to find which event it belongs to
             logger.info("Step 1: Connecting to Redis and finding session")
             redis_client = await self.get_redis()
-            session_json = None
-            event_id = None
-            
-            # Search for session across all events
-            async for key in redis_client.scan_iter(match="event:*:session:*"):
-                if f":session:{session_id}" in key:
-                    session_json = await redis_client.get(key)
-                    if session_json:
-                        event_id = key.split(':')[1]  # Extract event_id from key
-                        break
+            session_key, session_json = await self._find_session(session_id)
             
             if not session_json:
                 logger.error(f"Session not found: {session_id}")
                 return {"error": "Session not found", "session_id": session_id}
+            event_id = session_key.split(':')[1]  # Extract event_id from key
             
             logger.info("Step 2: Session found, parsing data")
             session_data = json.loads(session_json)
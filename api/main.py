@@ -1,11 +1,12 @@
-from typing import Dict, List, Literal, Any
-from fastapi import FastAPI, Query
+from typing import Dict, List, Literal, Any, Optional
+from fastapi import FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 import redis.asyncio as redis
 import json
 import os
+import re
 from dotenv import load_dotenv
 
 # Import MCP tools
@@ -42,9 +43,63 @@ try:
             return {"error": f"Unknown events tool: {tool_name}"}
     
     
+    BATCH_REF_PATTERN = re.compile(r"^\$\[(\d+)\]\.(\w+)$")
+    MAX_BATCH_CALLS = 20
+    
+    def resolve_batch_refs(arguments, results):
+        """Replace "$[i].field" argument values with that field of the i-th earlier result."""
+        resolved = {}
+        for key, value in arguments.items():
+            match = BATCH_REF_PATTERN.match(value) if isinstance(value, str) else None
+            if match:
+                index, field = int(match.group(1)), match.group(2)
+                if index >= len(results):
+                    raise ValueError(f"Batch reference {value} points past the calls already run")
+                if field not in results[index]:
+                    raise ValueError(f"Batch reference {value} does not match a field of that result")
+                value = results[index][field]
+            resolved[key] = value
+        return resolved
+    
+    async def execute_batch_tool(args):
+        """Execute a list of tool calls in order, stopping at the first error."""
+        calls = args.get("calls", [])
+        if not isinstance(calls, list) or not calls:
+            return {"error": "mcp.batch requires a non-empty list of calls"}
+        if len(calls) > MAX_BATCH_CALLS:
+            return {"error": f"mcp.batch accepts at most {MAX_BATCH_CALLS} calls, got {len(calls)}"}
+        
+        results = []
+        for call in calls:
+            if not isinstance(call, dict) or not isinstance(call.get("arguments", {}), dict):
+                results.append({"error": "Each batch call must be an object with a tool and an arguments object"})
+                break
+            tool = call.get("tool", "")
+            if tool == 'mcp.batch':
+                results.append({"error": "mcp.batch calls cannot be nested"})
+                break
+            try:
+                arguments = resolve_batch_refs(call.get("arguments", {}), results)
+            except ValueError as e:
+                results.append({"error": str(e)})
+                break
+            result = await execute_mcp_tool(tool, arguments)
+            if not isinstance(result, dict):
+                # Later calls can only reference fields of object results
+                result = {"error": f"{tool} returned a non-object result"}
+            results.append(result)
+            if "error" in result:
+                break
+        completed = len(results) == len(calls) and "error" not in results[-1]
+        return {"results": results, "completed": completed}
+    
+    
     async def execute_mcp_tool(tool, args):
+        # Batched calls share one request/response round trip
+        if tool == 'mcp.batch':
+            return await execute_batch_tool(args)
         # Try recordings domain
-        if tool.startswith('pitches.'):
+        elif tool.startswith('pitches.'):
             return await recordings_execute(tool, args)
         # Try events domain 
         elif tool.startswith('events.'):
@@ -62,7 +117,7 @@ try:
             return {"error": f"Unknown tool: {tool}"}
     
     def list_available_tools():
-        tools = []
+        tools = ['mcp.batch']
         tools.extend(recordings_tools())
         tools.extend(list(EVENTS_MCP_TOOLS.keys()))
         tools.extend([tool["name"] for tool in USERS_TOOLS])
@@ -221,6 +276,44 @@ async def mcp_execute(request: MCPExecuteRequest):
         return {"error": str(e)}
 
 
+# Largest raw audio body accepted by the upload endpoint; recordings over 10MB
+# still go through, they just use Gladia's WebSocket path instead of batch
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+
+@app.post("/mcp/pitches/stop_recording")
+async def mcp_stop_recording_upload(
+    request: Request,
+    session_id: str = Query(...),
+    audio_format: Optional[str] = Query(None)
+):
+    """Stop a recording with the audio sent as the raw request body instead of base64 JSON"""
+    try:
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+            return {"error": f"Audio upload exceeds {MAX_UPLOAD_BYTES} bytes"}
+        
+        # Read in chunks so a body without an honest Content-Length is still capped
+        audio_data = bytearray()
+        async for chunk in request.stream():
+            audio_data += chunk
+            if len(audio_data) > MAX_UPLOAD_BYTES:
+                return {"error": f"Audio upload exceeds {MAX_UPLOAD_BYTES} bytes"}
+        if not audio_data:
+            return {"error": "Request body is empty; send the recorded audio bytes"}
+        
+        result = await execute_mcp_tool("pitches.stop_recording", {
+            "session_id": session_id,
+            "audio_data": bytes(audio_data),
+            "audio_format": audio_format
+        })
+        if isinstance(result, dict) and "error" in result:
+            return {"error": result["error"]}
+        return result
+    except Exception as e:
+        return {"error": str(e)}
+
+
 # Scoring endpoints
 @app.get("/api/sessions")
 async def list_sessions():
@@ -7,6 +7,33 @@ import sys
 
 sys.path.insert(0, '/Users/allierays/Sites/pitchscoop/api')
 
+async def find_latest_session(redis_client):
+    """Return the newest live session's key and parsed data from one scan and one pipelined batch of GETs.
+    
+    Returns (None, None) when there are no sessions.
+    """
+    keys = [key async for key in redis_client.scan_iter(match='event:*:session:*', count=500)]
+    if not keys:
+        return None, None
+    
+    pipe = redis_client.pipeline()
+    for key in keys:
+        pipe.get(key)
+    values = await pipe.execute()
+    
+    latest_key, latest, latest_created_at = None, None, ''
+    for key, session_json in zip(keys, values):
+        if session_json:
+            try:
+                session = json.loads(session_json)
+            except ValueError:
+                continue
+            created_at = session.get('created_at') or ''
+            if latest_key is None or created_at > latest_created_at:
+                latest_key, latest, latest_created_at = key, session, created_at
+    
+    return latest_key, latest
+
 async def debug_audio_issue():
     print('🔍 Root Cause: Audio Processing Issue')
     print('=' * 50)
@@ -14,15 +41,10 @@ async def debug_audio_issue():
     redis_client = redis.from_url('redis://redis:6379/0', decode_responses=True)
     
     # Get latest session
-    sessions = []
-    async for key in redis_client.scan_iter(match='event:*:session:*'):
-        session_json = await redis_client.get(key)
-        if session_json:
-            session_data = json.loads(session_json)
-            sessions.append((session_data.get('created_at', ''), session_data))
-    
-    sessions.sort(reverse=True)
-    latest = sessions[0][1]
+    latest_key, latest = await find_latest_session(redis_client)
+    if not latest_key:
+        print('❌ No sessions found in Redis')
+        return
     
     print('📊 ISSUE ANALYSIS:')
     print(f'   Audio Size: {latest.get("audio_size", 0)} bytes')
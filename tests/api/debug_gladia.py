@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 
+import array
 import asyncio
 import base64
-import struct
 import math
 import json
 import sys
@@ -19,15 +19,18 @@ async def test_full_workflow():
     
     # Generate synthetic audio (like browser does)
     def generate_test_audio(duration=2.0, sample_rate=16000):
-        samples = []
-        for i in range(int(sample_rate * duration)):
+        def sample(i):
             t = i / sample_rate
             # Speech-like audio with varying frequency and amplitude
             frequency = 300 + 200 * math.sin(t * 2)
             amplitude = 0.3 * (1 + 0.5 * math.sin(t * 8))
-            sample = int(16383 * amplitude * math.sin(2 * math.pi * frequency * t))
-            samples.append(struct.pack('<h', sample))
-        return b''.join(samples)
+            return int(16383 * amplitude * math.sin(2 * math.pi * frequency * t))
+        
+        # Pack every sample into one int16 buffer instead of per-sample bytes objects
+        samples = array.array('h', map(sample, range(int(sample_rate * duration))))
+        if sys.byteorder != 'little':
+            samples.byteswap()
+        return samples.tobytes()
     
     handler = GladiaMCPHandler()
     
@@ -10,35 +10,119 @@ import json
 import sys
 import os
 import tempfile
-import subprocess
 import wave
-import struct
+from pathlib import Path
+
+# Shared helpers live in tests/; make them importable when this script is run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from audio_diag import amplitude_stats, ffmpeg_volume_lines, get_logger, wav_volume_lines
+
+log = get_logger('debug_microphone')
 
 sys.path.insert(0, '/Users/allierays/Sites/pitchscoop/api')
 
+async def find_latest_session(redis_client):
+    """Return the newest live session's key and parsed data from one scan and one pipelined batch of GETs.
+    
+    Returns (None, None) when there are no sessions.
+    """
+    keys = [key async for key in redis_client.scan_iter(match='event:*:session:*', count=500)]
+    if not keys:
+        return None, None
+    
+    pipe = redis_client.pipeline()
+    for key in keys:
+        pipe.get(key)
+    values = await pipe.execute()
+    
+    latest_key, latest, latest_created_at = None, None, ''
+    for key, session_json in zip(keys, values):
+        if session_json:
+            try:
+                session = json.loads(session_json)
+            except ValueError:
+                continue
+            created_at = session.get('created_at') or ''
+            if latest_key is None or created_at > latest_created_at:
+                latest_key, latest, latest_created_at = key, session, created_at
+    
+    return latest_key, latest
+
+def write_temp_audio(audio_data, suffix='.wav'):
+    """Write audio bytes to a new temp file with unbuffered os.write calls."""
+    fd, audio_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        view = memoryview(audio_data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return audio_path
+
+async def run_config(session, audio_url, config):
+    """Submit one transcription config to Gladia and poll for its result."""
+    import aiohttp
+    
+    payload = {
+        'audio_url': audio_url,
+        'language': 'en',
+        'audio_enhancer': config.get('audio_enhancer', False)
+    }
+    
+    async with session.post(
+        'https://api.gladia.io/v2/pre-recorded',
+        json=payload,
+        timeout=aiohttp.ClientTimeout(total=30)
+    ) as response:
+        if response.status not in [200, 201]:
+            return f'❌ Request failed: {await response.text()}'
+        result = await response.json()
+        result_url = result.get('result_url')
+    
+    async def poll_until_done():
+        # Geometric back-off so fast jobs are picked up after ~0.2s
+        delay = 0.2
+        while True:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 3.0)
+            
+            async with session.get(result_url) as poll_response:
+                if poll_response.status == 200:
+                    poll_result = await poll_response.json()
+                    if poll_result.get('status') in ['done', 'completed']:
+                        utterances = poll_result.get('result', {}).get('transcription', {}).get('utterances', [])
+                        if utterances:
+                            return f'✅ Got transcript: "{utterances[0].get("text", "")[:50]}..."'
+                        return '❌ No transcript (Gladia found no speech)'
+    
+    try:
+        return await asyncio.wait_for(poll_until_done(), timeout=30)
+    except asyncio.TimeoutError:
+        return '⚠️ Timed out waiting for transcription result'
+
 async def debug_microphone():
-    print('🎤 Microphone Audio Debugging Tool')
-    print('=' * 50)
+    log.info('🎤 Microphone Audio Debugging Tool')
+    log.info('=' * 50)
     
     # Get the latest session from Redis
-    print('\n1. Finding latest recording session...')
+    log.info('\n1. Finding latest recording session...')
     
     import redis.asyncio as redis
     redis_client = redis.Redis(host='redis', port=6379, decode_responses=True)
     
     # Find the most recent session
     session_id = None
-    async for key in redis_client.scan_iter(match="event:*:session:*"):
-        session_id = key.split(':')[-1]
-        print(f'Found session: {session_id}')
-        break
+    latest_key, _ = await find_latest_session(redis_client)
+    if latest_key:
+        session_id = latest_key.split(':')[-1]
+        log.info(f'Found session: {session_id}')
     
     if not session_id:
-        print('❌ No sessions found. Please record something first at http://localhost:8000/test')
+        log.error('❌ No sessions found. Please record something first at http://localhost:8000/test')
         return
     
     # Get the audio from MinIO using existing infrastructure
-    print('\n2. Retrieving audio from MinIO...')
+    log.info('\n2. Retrieving audio from MinIO...')
     
     try:
         # Import the existing MinIO storage module
@@ -47,57 +131,50 @@ async def debug_microphone():
         # Get the audio info first
         audio_info = await minio_audio_storage.get_audio_info(session_id)
         if not audio_info:
-            print(f'❌ No audio found for session {session_id}')
+            log.error(f'❌ No audio found for session {session_id}')
             return
             
-        print(f"Found audio: {audio_info.get('size', 0)} bytes")
+        log.info(f"Found audio: {audio_info.get('size', 0)} bytes")
         
         # Download the audio
         audio_data = await minio_audio_storage.download_audio(session_id)
         if not audio_data:
-            print('❌ Failed to download audio')
+            log.error('❌ Failed to download audio')
             return
             
-        print(f'✅ Retrieved audio: {len(audio_data)} bytes')
+        log.info(f'✅ Retrieved audio: {len(audio_data)} bytes')
         
         # Save to temp file for analysis
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-            tmp_file.write(audio_data)
-            audio_path = tmp_file.name
+        audio_path = write_temp_audio(audio_data)
             
     except Exception as e:
-        print(f'❌ Failed to retrieve audio: {e}')
+        log.error(f'❌ Failed to retrieve audio: {e}')
         import traceback
         traceback.print_exc()
         return
     
     # Analyze the audio
-    print('\n3. Analyzing audio file...')
+    log.info('\n3. Analyzing audio file...')
     
     try:
-        # Use FFmpeg to get audio stats
-        ffmpeg_cmd = [
-            'ffmpeg', '-i', audio_path, 
-            '-af', 'volumedetect',
-            '-f', 'null', '-'
-        ]
+        # 16-bit WAV volume stats are computed in-process; other formats go through FFmpeg
+        is_wav = audio_data[:4] == b'RIFF' and audio_data[8:12] == b'WAVE'
+        volume_lines = wav_volume_lines(audio_path) if is_wav else None
         
-        result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True, timeout=10)
+        if volume_lines is None:
+            volume_lines = ffmpeg_volume_lines(audio_path)
         
-        # Parse volume stats
-        output = result.stderr
-        for line in output.split('\n'):
-            if 'mean_volume' in line or 'max_volume' in line:
-                print(f'   {line.strip()}')
+        for line in volume_lines:
+            log.info(f'   {line}')
         
         # Get basic WAV info
         with wave.open(audio_path, 'rb') as wav_file:
             params = wav_file.getparams()
-            print(f'\n   WAV Format:')
-            print(f'   - Channels: {params.nchannels}')
-            print(f'   - Sample Rate: {params.framerate} Hz')
-            print(f'   - Sample Width: {params.sampwidth} bytes')
-            print(f'   - Duration: {params.nframes / params.framerate:.2f} seconds')
+            log.info(f'\n   WAV Format:')
+            log.info(f'   - Channels: {params.nchannels}')
+            log.info(f'   - Sample Rate: {params.framerate} Hz')
+            log.info(f'   - Sample Width: {params.sampwidth} bytes')
+            log.info(f'   - Duration: {params.nframes / params.framerate:.2f} seconds')
             
             # Read first few samples to check if there's actual audio
             wav_file.rewind()
@@ -105,54 +182,56 @@ async def debug_microphone():
             
             # Convert to samples
             if params.sampwidth == 2:  # 16-bit
-                samples = struct.unpack(f'<{len(frames)//2}h', frames)
-                max_sample = max(abs(s) for s in samples)
-                avg_sample = sum(abs(s) for s in samples) / len(samples)
+                max_sample, avg_sample = amplitude_stats(frames)
                 
-                print(f'\n   Audio Signal Analysis:')
-                print(f'   - Max amplitude: {max_sample} (out of 32768)')
-                print(f'   - Avg amplitude: {avg_sample:.1f}')
-                print(f'   - Volume level: {(max_sample/32768)*100:.1f}%')
+                log.info(f'\n   Audio Signal Analysis:')
+                log.info(f'   - Max amplitude: {max_sample} (out of 32768)')
+                log.info(f'   - Avg amplitude: {avg_sample:.1f}')
+                log.info(f'   - Volume level: {(max_sample/32768)*100:.1f}%')
                 
                 if max_sample < 100:
-                    print('   ⚠️ AUDIO IS NEARLY SILENT!')
+                    log.warning('   ⚠️ AUDIO IS NEARLY SILENT!')
                 elif max_sample < 1000:
-                    print('   ⚠️ Audio is very quiet')
+                    log.warning('   ⚠️ Audio is very quiet')
                 elif max_sample < 5000:
-                    print('   ⚠️ Audio volume is low')
+                    log.warning('   ⚠️ Audio volume is low')
                 else:
-                    print('   ✅ Audio volume looks OK')
+                    log.info('   ✅ Audio volume looks OK')
         
         # Test with different Gladia settings
-        print('\n4. Testing Gladia with different configurations...')
+        log.info('\n4. Testing Gladia with different configurations...')
         
         api_key = os.getenv('GLADIA_API_KEY')
         if not api_key:
-            print('❌ No GLADIA_API_KEY found')
+            log.error('❌ No GLADIA_API_KEY found')
             return
         
         # Try uploading the audio directly to Gladia
         import aiohttp
         
-        async with aiohttp.ClientSession() as session:
-            # Upload the audio
-            with open(audio_path, 'rb') as f:
-                data = aiohttp.FormData()
-                data.add_field('audio', f, filename='test.wav', content_type='audio/wav')
-                
-                async with session.post(
-                    'https://api.gladia.io/v2/upload',
-                    headers={'X-Gladia-Key': api_key},
-                    data=data,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status in [200, 201]:
-                        upload_result = await response.json()
-                        audio_url = upload_result.get('audio_url')
-                        print(f'✅ Upload successful')
-                    else:
-                        print(f'❌ Upload failed: {await response.text()}')
-                        return
+        # One pooled keep-alive connection set for the upload and all polls;
+        # the API key is sent as a session-level header
+        connector = aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=60)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers={'X-Gladia-Key': api_key}
+        ) as session:
+            # Upload the audio straight from memory
+            data = aiohttp.FormData()
+            data.add_field('audio', audio_data, filename='test.wav', content_type='audio/wav')
+            
+            async with session.post(
+                'https://api.gladia.io/v2/upload',
+                data=data,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                if response.status in [200, 201]:
+                    upload_result = await response.json()
+                    audio_url = upload_result.get('audio_url')
+                    log.info(f'✅ Upload successful')
+                else:
+                    log.error(f'❌ Upload failed: {await response.text()}')
+                    return
             
             # Try transcription with audio enhancement
             configs = [
@@ -160,66 +239,33 @@ async def debug_microphone():
                 {'audio_enhancer': False, 'name': 'Without enhancement'},
             ]
             
-            for config in configs:
-                print(f'\n   Testing: {config["name"]}...')
-                
-                payload = {
-                    'audio_url': audio_url,
-                    'language': 'en',
-                    'audio_enhancer': config.get('audio_enhancer', False)
-                }
-                
-                async with session.post(
-                    'https://api.gladia.io/v2/pre-recorded',
-                    headers={
-                        'X-Gladia-Key': api_key,
-                        'Content-Type': 'application/json'
-                    },
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status in [200, 201]:
-                        result = await response.json()
-                        result_url = result.get('result_url')
-                        
-                        # Poll for results
-                        for _ in range(5):
-                            await asyncio.sleep(2)
-                            
-                            async with session.get(
-                                result_url,
-                                headers={'X-Gladia-Key': api_key}
-                            ) as poll_response:
-                                if poll_response.status == 200:
-                                    poll_result = await poll_response.json()
-                                    if poll_result.get('status') in ['done', 'completed']:
-                                        utterances = poll_result.get('result', {}).get('transcription', {}).get('utterances', [])
-                                        if utterances:
-                                            print(f'   ✅ Got transcript: "{utterances[0].get("text", "")[:50]}..."')
-                                        else:
-                                            print(f'   ❌ No transcript (Gladia found no speech)')
-                                        break
-                    else:
-                        print(f'   ❌ Request failed: {await response.text()}')
+            # Configs are independent, so submit and poll them concurrently
+            messages = await asyncio.gather(
+                *(run_config(session, audio_url, config) for config in configs)
+            )
+            
+            for config, message in zip(configs, messages):
+                log.info(f'\n   Testing: {config["name"]}...')
+                log.info(f'   {message}')
         
-        print('\n' + '=' * 50)
-        print('📊 DIAGNOSIS:')
+        log.info('\n' + '=' * 50)
+        log.info('📊 DIAGNOSIS:')
         
         if max_sample < 100:
-            print('❌ PROBLEM: Audio is completely silent or nearly silent')
-            print('   SOLUTION: Check microphone permissions and volume settings')
+            log.error('❌ PROBLEM: Audio is completely silent or nearly silent')
+            log.info('   SOLUTION: Check microphone permissions and volume settings')
         elif max_sample < 1000:
-            print('⚠️ PROBLEM: Audio volume is extremely low')
-            print('   SOLUTION: Speak louder or move closer to microphone')
+            log.warning('⚠️ PROBLEM: Audio volume is extremely low')
+            log.info('   SOLUTION: Speak louder or move closer to microphone')
         else:
-            print('🤔 Audio volume seems OK, but Gladia is not detecting speech')
-            print('   POSSIBLE ISSUES:')
-            print('   - Too much background noise')
-            print('   - Audio codec incompatibility')
-            print('   - Microphone producing non-speech frequencies')
+            log.info('🤔 Audio volume seems OK, but Gladia is not detecting speech')
+            log.info('   POSSIBLE ISSUES:')
+            log.info('   - Too much background noise')
+            log.info('   - Audio codec incompatibility')
+            log.info('   - Microphone producing non-speech frequencies')
         
     except Exception as e:
-        print(f'❌ Error analyzing audio: {e}')
+        log.error(f'❌ Error analyzing audio: {e}')
         import traceback
         traceback.print_exc()
     finally:
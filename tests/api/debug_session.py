@@ -8,12 +8,15 @@ async def check_latest():
     # Find the most recent session
     keys = await client.keys('event:*:session:*')
     if keys:
-        latest_key = sorted(keys)[-1]
-        print(f'Latest session key: {latest_key}')
-        
-        data = await client.get(latest_key)
-        if data:
-            session = json.loads(data)
+        # Session keys end in a random UUID, so order by the stored created_at instead
+        sessions = [
+            (key, json.loads(value))
+            for key, value in zip(keys, await client.mget(keys)) if value
+        ]
+        if sessions:
+            latest_key, session = max(sessions, key=lambda item: item[1].get('created_at', ''))
+            print(f'Latest session key: {latest_key}')
+            
             print(f'Session ID: {session.get("session_id")}')
             print(f'Status: {session.get("status")}')
             
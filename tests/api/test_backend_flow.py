@@ -3,70 +3,70 @@
 Test the complete backend flow to see where it's failing.
 """
 
-import requests
 import base64
 import json
+import os
+import sys
+from pathlib import Path
+
+# Shared helpers live in tests/; make them importable when this script is run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mcp_flow import loads_json, open_mcp_session, post_tool, start_test_session
+
+try:
+    from pybase64 import b64encode_as_string
+except ImportError:
+    def b64encode_as_string(data):
+        return base64.b64encode(data).decode('ascii')
+
+# Send stop_recording audio as a raw request body instead of base64-in-JSON
+USE_RAW_UPLOAD = bool(os.getenv('PS_RAW_UPLOAD'))
+
+# Simple WebM-like data, built and encoded once per process
+_WEBM_PAYLOAD = b'\x1a\x45\xdf\xa3' + bytes(1000)  # Minimal WebM signature
+_WEBM_B64 = b64encode_as_string(_WEBM_PAYLOAD)
 
 def test_backend_flow():
+    # One pooled session keeps the MCP calls on a single keep-alive connection
+    with open_mcp_session() as http:
+        _test_backend_flow(http)
+
+def _test_backend_flow(http):
     print('🔧 Testing Backend Audio Flow')
     print('=' * 50)
     
-    # Create a simple WebM-like data
-    webm_data = b'\x1a\x45\xdf\xa3' + b'\x00' * 1000  # Minimal WebM signature
-    webm_base64 = base64.b64encode(webm_data).decode('utf-8')
-    
-    print('\n1. Creating event...')
-    response = requests.post('http://localhost:8000/mcp/execute', json={
-        'tool': 'events.create_event',
-        'arguments': {
-            'event_type': 'individual_practice',
-            'event_name': 'Backend Flow Test',
-            'description': 'Testing audio conversion flow',
-            'max_participants': 1,
-            'duration_minutes': 5
-        }
-    })
+    webm_data = _WEBM_PAYLOAD
+    webm_base64 = _WEBM_B64
     
-    event_data = response.json()
-    if 'error' in event_data:
-        print(f'❌ Event creation failed: {event_data["error"]}')
-        return
-    
-    event_id = event_data['event_id']
-    print(f'✅ Event created: {event_id}')
-    
-    print('\n2. Starting session...')
-    response = requests.post('http://localhost:8000/mcp/execute', json={
-        'tool': 'pitches.start_recording',
-        'arguments': {
-            'event_id': event_id,
-            'team_name': 'Flow Test Team',
-            'pitch_title': 'Backend Test'
-        }
-    })
-    
-    session_data = response.json()
+    print('\n1. Creating event and session...')
+    event_id, session_data = start_test_session(http, 'Flow Test Team', 'Backend Test')
     if 'error' in session_data:
-        print(f'❌ Session creation failed: {session_data["error"]}')
+        print(f'❌ Setup failed: {session_data["error"]}')
         return
     
+    print(f'✅ Event: {event_id}')
     session_id = session_data['session_id']
     print(f'✅ Session created: {session_id}')
     
-    print('\n3. Sending WebM data with audio_format parameter...')
+    print('\n2. Sending WebM data with audio_format parameter...')
     print(f'   Sending {len(webm_data)} bytes of WebM data')
     print(f'   audio_format: "webm"')
     
-    response = requests.post('http://localhost:8000/mcp/execute', json={
-        'tool': 'pitches.stop_recording',
-        'arguments': {
+    if USE_RAW_UPLOAD:
+        response = http.post(
+            'http://localhost:8000/mcp/pitches/stop_recording',
+            params={'session_id': session_id, 'audio_format': 'webm'},
+            data=webm_data,
+            headers={'Content-Type': 'application/octet-stream'}
+        )
+    else:
+        response = post_tool(http, 'pitches.stop_recording', {
             'session_id': session_id,
             'audio_data_base64': webm_base64,
             'audio_format': 'webm'  # THIS SHOULD TRIGGER CONVERSION
-        }
-    })
+        })
     
-    result = response.json()
+    result = loads_json(response.content)
     
     print('\n📊 Backend Response:')
     print(f'Status: {result.get("status")}')
@@ -83,19 +83,16 @@ def test_backend_flow():
             
             # Check the stored format
             if audio.get('playback_url'):
-                print('\n4. Checking stored audio format...')
+                print('\n3. Checking stored audio format...')
                 
                 # Get the audio to check its format
-                playback_response = requests.post('http://localhost:8000/mcp/execute', json={
-                    'tool': 'pitches.get_playback_url',
-                    'arguments': {
-                        'session_id': session_id,
-                        'expires_hours': 1
-                    }
+                playback_response = post_tool(http, 'pitches.get_playback_url', {
+                    'session_id': session_id,
+                    'expires_hours': 1
                 })
                 
                 if playback_response.status_code == 200:
-                    playback_data = playback_response.json()
+                    playback_data = loads_json(playback_response.content)
                     url = playback_data.get('playback_url', '')
                     
                     # The URL should end with .wav if conversion worked
@@ -7,6 +7,9 @@ import base64
 import tempfile
 import subprocess
 import os
+import re
+
+_VOLUME_RE = re.compile(rb'(?:mean|max)_volume:\s*-?[\d.]+\s*dB')
 
 def test_conversion():
     print('🔧 Testing WebM to WAV Conversion')
@@ -25,7 +28,7 @@ def test_conversion():
         # Generate a test audio with speech-like characteristics
         # Use multiple sine waves to simulate speech frequencies
         generate_cmd = [
-            'ffmpeg',
+            'ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error',
             '-f', 'lavfi',
             '-i', 'sine=frequency=200:duration=2',  # Base frequency
             '-f', 'lavfi', 
@@ -102,12 +105,11 @@ def test_conversion():
             '-f', 'null', '-'
         ]
         
-        result = subprocess.run(volume_cmd, capture_output=True, text=True, timeout=10)
+        result = subprocess.run(volume_cmd, capture_output=True, timeout=10)
         
         if result.returncode == 0:
-            for line in result.stderr.split('\n'):
-                if 'mean_volume' in line or 'max_volume' in line:
-                    print(f'   {line.strip()}')
+            for match in _VOLUME_RE.finditer(result.stderr):
+                print(f'   {match.group(0).decode()}')
                     
     finally:
         # Cleanup
@@ -31,7 +31,7 @@ async def test_direct():
     print(f'Session: {session_id}')
     
     # Create dummy WebM data
-    webm_data = b'\x1a\x45\xdf\xa3' + b'\x00' * 1000
+    webm_data = b'\x1a\x45\xdf\xa3' + bytes(1000)
     webm_base64 = base64.b64encode(webm_data).decode('utf-8')
     
     print('\nCalling stop_recording with:')
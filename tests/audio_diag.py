@@ -0,0 +1,196 @@
+"""
+Shared audio analysis helpers for the audio debug scripts.
+
+check_audio, check_latest and debug_microphone all probe a recording,
+measure its volume and inspect raw PCM samples. The single-pass ffmpeg
+analysis, the NumPy statistics and the content-hash cache live here so
+the scripts stay in sync.
+"""
+
+import array
+import json
+import logging
+import math
+import os
+import operator
+import re
+import subprocess
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    # Falls back to zero-copy stdlib int16 views below
+    np = None
+
+
+PROBE_CACHE_PATH = Path(tempfile.gettempdir()) / 'pitchscoop_probe_cache.json'
+
+_STREAM_RE = re.compile(r'Stream #0:\d+.*?: Audio: (\w+).*?, (\d+) Hz, ([^,\n]+)')
+_DURATION_RE = re.compile(r'Duration: ([\d:.]+|N/A)(?:, start: [^,]+)?(?:, bitrate: (\S+ kb/s|N/A))?')
+_VOLUME_RE = re.compile(rb'(?:mean|max)_volume:\s*-?[\d.]+\s*dB')
+
+
+def get_logger(name):
+    """Return a logger that writes bare messages to stdout for the debug scripts.
+
+    Set PITCHSCOOP_DEBUG_LOG_LEVEL=WARNING to keep only problems in batch runs.
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(os.getenv('PITCHSCOOP_DEBUG_LOG_LEVEL', 'INFO').upper())
+    return logger
+
+
+def parse_audio_properties(stderr_text):
+    """Parse input stream properties from ffmpeg's stderr banner."""
+    properties = {}
+    stream = _STREAM_RE.search(stderr_text)
+    if stream:
+        properties['codec_name'] = stream.group(1)
+        properties['sample_rate'] = stream.group(2)
+        properties['channels'] = stream.group(3).strip()
+    duration = _DURATION_RE.search(stderr_text)
+    if duration:
+        properties['duration'] = duration.group(1)
+        if duration.group(2):
+            properties['bit_rate'] = duration.group(2)
+    return properties
+
+
+def _int16_view(pcm_data):
+    """View s16le PCM as int16 samples without NumPy (zero-copy on little-endian hosts)."""
+    usable = len(pcm_data) // 2 * 2
+    if sys.byteorder == 'little':
+        return memoryview(pcm_data)[:usable].cast('h')
+    samples = array.array('h')
+    samples.frombytes(pcm_data[:usable])
+    samples.byteswap()
+    return samples
+
+
+def to_dbfs(amplitude):
+    """Convert a 16-bit amplitude to dBFS, flooring silence like volumedetect."""
+    return 20 * math.log10(amplitude / 32768) if amplitude > 0 else -91.0
+
+
+def volume_lines(pcm_data):
+    """Compute volumedetect-style mean (RMS) and max (peak) volume from s16le PCM."""
+    if np is None:
+        samples = _int16_view(pcm_data)
+        if not len(samples):
+            return []
+        rms = math.sqrt(sum(map(operator.mul, samples, samples)) / len(samples))
+        peak = max(map(abs, samples))
+    else:
+        samples = np.frombuffer(pcm_data, dtype='<i2', count=len(pcm_data) // 2).astype(np.float64)
+        if not samples.size:
+            return []
+        rms = float(np.sqrt(np.mean(samples ** 2)))
+        peak = float(np.abs(samples).max())
+
+    return [
+        f'mean_volume: {to_dbfs(rms):.1f} dB',
+        f'max_volume: {to_dbfs(peak):.1f} dB',
+    ]
+
+
+def wav_volume_lines(audio_path):
+    """Compute volume lines for a 16-bit WAV in-process, or None if not applicable."""
+    with wave.open(audio_path, 'rb') as wav_file:
+        if wav_file.getsampwidth() != 2:
+            return None
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    return volume_lines(frames) or None
+
+
+def ffmpeg_volume_lines(audio_path):
+    """Run ffmpeg volumedetect for formats that cannot be decoded in-process."""
+    volume_cmd = [
+        'ffmpeg', '-hide_banner', '-nostdin', '-i', audio_path,
+        '-af', 'volumedetect',
+        '-f', 'null', '-'
+    ]
+
+    result = subprocess.run(volume_cmd, capture_output=True, timeout=10)
+    return [match.group(0).decode() for match in _VOLUME_RE.finditer(result.stderr)]
+
+
+def amplitude_stats(pcm_data):
+    """Return (max, mean) absolute amplitude of s16le PCM."""
+    if np is None:
+        samples = _int16_view(pcm_data)
+        if not len(samples):
+            return 0, 0.0
+        return max(map(abs, samples)), sum(map(abs, samples)) / len(samples)
+
+    # Widen before abs() so -32768 does not overflow int16
+    samples = np.abs(np.frombuffer(pcm_data, dtype='<i2', count=len(pcm_data) // 2).astype(np.int32))
+    if not samples.size:
+        return 0, 0.0
+    return int(samples.max()), float(samples.mean())
+
+
+def extract_pcm(audio_path):
+    """Probe format and extract 16kHz mono s16le PCM in one ffmpeg pass.
+
+    Returns a JSON-serializable analysis dict and the raw PCM bytes.
+    """
+    analysis_cmd = [
+        'ffmpeg', '-hide_banner', '-nostdin', '-i', audio_path,
+        '-f', 's16le',  # 16-bit PCM
+        '-acodec', 'pcm_s16le',
+        '-ar', '16000',
+        '-ac', '1',
+        'pipe:1'
+    ]
+
+    result = subprocess.run(analysis_cmd, capture_output=True, timeout=10)
+    stderr_text = result.stderr.decode('utf-8', errors='replace')
+    pcm_data = result.stdout if result.returncode == 0 else b''
+
+    analysis = {
+        'properties': parse_audio_properties(stderr_text),
+        'volume_lines': volume_lines(pcm_data),
+        'pcm_extracted': result.returncode == 0,
+        'pcm_size': len(pcm_data),
+        'error': '' if result.returncode == 0 else stderr_text[:200],
+    }
+    return analysis, pcm_data
+
+
+def load_probe_cache():
+    """Load cached analysis results keyed by audio content hash."""
+    try:
+        return json.loads(PROBE_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_probe_cache(cache):
+    """Persist cached analysis results, ignoring write failures."""
+    try:
+        PROBE_CACHE_PATH.write_text(json.dumps(cache))
+    except OSError:
+        pass
+
+
+def cached_analysis(cache_key, analyze):
+    """Return (analysis, from_cache), calling analyze() only on a cache miss."""
+    probe_cache = load_probe_cache()
+    if cache_key in probe_cache:
+        return probe_cache[cache_key], True
+
+    analysis = analyze()
+    if analysis['pcm_extracted']:
+        probe_cache[cache_key] = analysis
+        save_probe_cache(probe_cache)
+    return analysis, False
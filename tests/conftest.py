@@ -1,16 +1,28 @@
 """
 Pytest configuration and shared fixtures for PitchScoop tests.
 """
+import os
 import sys
-from pathlib import Path
 import pytest
+import pytest_asyncio
 import asyncio
 from typing import Generator
 
-# Add project root and api directory to Python path for all tests
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(project_root / "api"))
+# Use uvloop's libuv-based event loop for async tests when it is installed
+if sys.platform != "win32":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+
+@pytest.fixture(scope="session", autouse=True)
+def test_env():
+    """Load .env once for the whole test session and return the resulting environment."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.environ.copy()
 
 
 @pytest.fixture(scope="session")
@@ -21,11 +33,30 @@ def event_loop() -> Generator:
     loop.close()
 
 
+@pytest_asyncio.fixture
+async def http_client():
+    """Shared aiohttp client session for tests that call the running API over HTTP.
+    
+    Created per test, in the test's own event loop; calls within a test still
+    reuse keep-alive connections.
+    """
+    import aiohttp
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit_per_host=4)) as session:
+        yield session
+
+
 @pytest.fixture
 def gladia_api_key():
     """Get Gladia API key from environment for integration tests."""
-    import os
     api_key = os.getenv("GLADIA_API_KEY")
     if not api_key:
         pytest.skip("GLADIA_API_KEY not set - skipping integration test")
-    return api_key
\ No newline at end of file
+    return api_key
+
+@pytest.fixture
+def bright_data_api_key():
+    """Get BrightData API key from environment for integration tests."""
+    api_key = os.getenv("BRIGHT_DATA_API_KEY")
+    if not api_key or api_key == "your_bright_data_api_key_here":
+        pytest.skip("BRIGHT_DATA_API_KEY not set - skipping integration test")
+    return api_key
@@ -3,8 +3,12 @@
 import asyncio
 import sys
 import json
+from pathlib import Path
 
-sys.path.insert(0, '/Users/allierays/Sites/pitchscoop/api')
+# Resolve the project root relative to this file, as tests/conftest.py does
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
 
 from api.domains.recordings.mcp.gladia_mcp_handler import GladiaMCPHandler
 
@@ -3,48 +3,62 @@
 Trace exactly what happens when we send audio with format parameter.
 """
 
-import requests
+import asyncio
 import base64
-import json
+import os
 import time
+import sys
+from pathlib import Path
+
+# Shared helpers live in tests/; make them importable when this script is run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mcp_flow import loads_json, open_mcp_session, post_tool, start_test_session
+
+try:
+    from pybase64 import b64encode_as_string
+except ImportError:
+    def b64encode_as_string(data):
+        return base64.b64encode(data).decode('ascii')
+
+# Send stop_recording audio as a raw request body instead of base64-in-JSON
+USE_RAW_UPLOAD = bool(os.getenv('PS_RAW_UPLOAD'))
+
+# Realistic WebM data (with proper header), built and encoded once per process
+_WEBM_HEADER = bytes([
+    0x1a, 0x45, 0xdf, 0xa3,  # EBML magic
+    0x9f, 0x42, 0x86, 0x81, 0x01,  # EBML version
+])
+_WEBM_PAYLOAD = _WEBM_HEADER + bytes(5000)  # 5KB of data
+_WEBM_B64 = b64encode_as_string(_WEBM_PAYLOAD)
+
+async def fetch_session_record(event_id, session_id):
+    """Return the stored record for a session, parsed straight from raw bytes."""
+    import redis.asyncio as redis
+    r = redis.Redis(host='redis', port=6379, decode_responses=False)
+    
+    try:
+        # Both IDs are known, so read the session key directly instead of scanning
+        raw = await r.get(f"event:{event_id}:session:{session_id}")
+        return loads_json(raw) if raw else None
+    finally:
+        await r.aclose()
 
 def trace_execution():
+    # One pooled session keeps the MCP calls on a single keep-alive connection
+    with open_mcp_session() as http:
+        _trace_execution(http)
+
+def _trace_execution(http):
     print('🔍 Tracing Backend Execution Path')
     print('=' * 50)
     
-    # Create realistic WebM data (with proper header)
-    webm_header = bytes([
-        0x1a, 0x45, 0xdf, 0xa3,  # EBML magic
-        0x9f, 0x42, 0x86, 0x81, 0x01,  # EBML version
-    ])
-    webm_data = webm_header + b'\x00' * 5000  # 5KB of data
-    webm_base64 = base64.b64encode(webm_data).decode('utf-8')
+    webm_data = _WEBM_PAYLOAD
+    webm_base64 = _WEBM_B64
     
     print('\n1. Setting up test...')
     
-    # Create event
-    response = requests.post('http://localhost:8000/mcp/execute', json={
-        'tool': 'events.create_event',
-        'arguments': {
-            'event_type': 'individual_practice',
-            'event_name': 'Trace Test',
-            'description': 'Tracing execution',
-            'max_participants': 1,
-            'duration_minutes': 5
-        }
-    })
-    event_id = response.json()['event_id']
-    
-    # Start session
-    response = requests.post('http://localhost:8000/mcp/execute', json={
-        'tool': 'pitches.start_recording',
-        'arguments': {
-            'event_id': event_id,
-            'team_name': 'Trace Team',
-            'pitch_title': 'Execution Trace'
-        }
-    })
-    session_id = response.json()['session_id']
+    event_id, session_data = start_test_session(http, 'Trace Team', 'Execution Trace')
+    session_id = session_data['session_id']
     print(f'✅ Session: {session_id}')
     
     print('\n2. Sending request with audio_format parameter...')
@@ -67,14 +81,22 @@ def trace_execution():
     
     # Send request
     print('\n3. Sending request...')
-    start_time = time.time()
+    t0 = time.perf_counter_ns()
     
-    response = requests.post('http://localhost:8000/mcp/execute', json=request_payload)
+    if USE_RAW_UPLOAD:
+        response = http.post(
+            'http://localhost:8000/mcp/pitches/stop_recording',
+            params={'session_id': session_id, 'audio_format': 'webm'},
+            data=webm_data,
+            headers={'Content-Type': 'application/octet-stream'}
+        )
+    else:
+        response = post_tool(http, request_payload['tool'], request_payload['arguments'])
     
-    elapsed = time.time() - start_time
+    elapsed = (time.perf_counter_ns() - t0) / 1e9
     print(f'Response received in {elapsed:.2f} seconds')
     
-    result = response.json()
+    result = loads_json(response.content)
     
     print('\n4. Analyzing response...')
     print(f'Status: {result.get("status")}')
@@ -99,16 +121,14 @@ def trace_execution():
         print('\n5. Checking what backend received...')
         
         # Get session data from Redis
-        import redis
-        r = redis.Redis(host='redis', port=6379, decode_responses=True)
-        
-        # Find session in Redis
-        for key in r.scan_iter(match=f"event:*:session:{session_id}"):
-            session_data = json.loads(r.get(key))
+        session_data = asyncio.run(fetch_session_record(event_id, session_id))
+        if session_data:
             print(f'Session status: {session_data.get("status")}')
             
             # Check if audio_format was logged
-            if 'audio_format' in str(session_data):
+            if 'audio_format' in session_data or any(
+                'audio_format' in value for value in session_data.values() if isinstance(value, dict)
+            ):
                 print('✅ audio_format was received by backend')
             else:
                 print('❌ audio_format was NOT received by backend!')
@@ -12,31 +12,31 @@ This test validates the entire workflow from event creation to audio storage:
 
 This is the most comprehensive integration test for the core platform functionality.
 """
+import array
 import asyncio
 import sys
 import os
-import struct
 import math
 import pytest
 
-# Add the api directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
-
 from api.domains.events.mcp.events_mcp_tools import execute_events_mcp_tool
 from api.domains.recordings.mcp.mcp_tools import execute_mcp_tool
-from api.domains.recordings.infrastructure.minio_audio_storage import MinIOAudioStorage
+
+# Shares live Redis/MinIO state with the other e2e service tests under pytest-xdist
+pytestmark = pytest.mark.xdist_group("e2e_http")
 
 
 def generate_test_audio(duration_seconds=2.0, sample_rate=16000, frequency=440):
     """Generate test audio data (sine wave)."""
-    samples = []
-    for i in range(int(sample_rate * duration_seconds)):
-        t = i / sample_rate
-        # Generate sine wave with moderate amplitude
-        sample = int(16383 * math.sin(2 * math.pi * frequency * t))
-        samples.append(struct.pack('<h', sample))
+    # Pack all samples into one contiguous int16 buffer instead of per-sample bytes
+    samples = array.array('h', [
+        int(16383 * math.sin(2 * math.pi * frequency * i / sample_rate))
+        for i in range(int(sample_rate * duration_seconds))
+    ])
+    if sys.byteorder != 'little':
+        samples.byteswap()
     
-    return b''.join(samples)
+    return samples.tobytes()
 
 
 @pytest.mark.asyncio
@@ -122,6 +122,7 @@ async def test_complete_recording_flow():
             print(f"   Playback URL: {audio_info['playback_url'][:60]}...")
             
             # Verify with direct MinIO access
+            from api.domains.recordings.infrastructure.minio_audio_storage import MinIOAudioStorage
             minio_storage = MinIOAudioStorage()
             minio_info = await minio_storage.get_audio_info(session_id)
             if minio_info:
@@ -3,79 +3,151 @@
 Test complete flow including transcript display
 """
 import asyncio
-import requests
-import base64
-import struct
-import math
+import os
+import aiohttp
+import pytest
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+import numpy as np
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BASE_URL = "http://localhost:8000/mcp/execute"
+UPLOAD_URL = "http://localhost:8000/mcp/pitches/stop_recording"
+
+# Send stop_recording audio as a raw request body instead of base64-in-JSON
+USE_RAW_UPLOAD = bool(os.getenv('PS_RAW_UPLOAD'))
 
 def generate_test_audio():
     """Generate a simple test audio file"""
     sample_rate = 16000
     duration = 2.0  # 2 seconds
     
-    samples = []
-    for i in range(int(sample_rate * duration)):
-        t = i / sample_rate
-        # Create a tone that might trigger some response
-        frequency = 400 + 100 * math.sin(t * 4)
-        amplitude = 0.4 * (1 + 0.3 * math.sin(t * 8))
-        sample = int(16383 * amplitude * math.sin(2 * math.pi * frequency * t))
-        samples.append(struct.pack('<h', sample))
+    t = np.arange(int(sample_rate * duration), dtype=np.float64) / sample_rate
+    # Create a tone that might trigger some response
+    frequency = 400 + 100 * np.sin(t * 4)
+    amplitude = 0.4 * (1 + 0.3 * np.sin(t * 8))
+    samples = 16383 * amplitude * np.sin(2 * np.pi * frequency * t)
     
-    return b''.join(samples)
+    return samples.astype('<i2').tobytes()
 
-def test_full_api_flow():
-    """Test the complete API flow"""
-    base_url = "http://localhost:8000/mcp/execute"
+def encode_test_audio():
+    """Generate the test audio and its base64 form for stop_recording"""
+    audio_data = generate_test_audio()
+    if USE_RAW_UPLOAD:
+        # Raw uploads send the bytes as-is, so skip the base64 encode
+        return audio_data, None
+    return audio_data, base64.b64encode(audio_data).decode('ascii')
+
+async def read_json(response):
+    """Parse a JSON response body, with orjson when it is installed"""
+    if orjson is None:
+        return await response.json()
+    return orjson.loads(await response.read())
+
+async def call_tool(http, tool, arguments):
+    """Execute an MCP tool and return the parsed JSON response"""
+    if orjson is None:
+        async with http.post(BASE_URL, json={"tool": tool, "arguments": arguments}) as response:
+            return await read_json(response)
     
+    # orjson keeps encoding the large base64 stop_recording payload cheap
+    async with http.post(
+        BASE_URL,
+        data=orjson.dumps({"tool": tool, "arguments": arguments}),
+        headers={"Content-Type": "application/json"}
+    ) as response:
+        return await read_json(response)
+
+async def call_batch(http, calls):
+    """Run dependent tool calls in one mcp.batch round trip.
+    
+    Returns one result per call; calls skipped after an error get an empty dict.
+    """
+    batch_data = await call_tool(http, "mcp.batch", {"calls": calls})
+    results = batch_data.get("results", [batch_data])
+    return results + [{}] * (len(calls) - len(results))
+
+async def upload_recording(http, session_id, audio_data):
+    """Stop a recording by sending the audio bytes as the raw request body"""
+    async with http.post(
+        UPLOAD_URL,
+        params={"session_id": session_id},
+        data=audio_data,
+        headers={"Content-Type": "application/octet-stream"}
+    ) as response:
+        return await read_json(response)
+
+# Shares the running API with the other live-service e2e tests under pytest-xdist
+pytestmark = pytest.mark.xdist_group("e2e_http")
+
+@pytest.mark.asyncio
+async def test_full_api_flow(http_client):
+    """Test the complete API flow"""
+    return await run_full_api_flow(http_client)
+
+async def run_standalone():
+    """Run the flow outside pytest with its own client session"""
+    # One client session keeps the MCP calls on a single keep-alive connection
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit_per_host=4)) as http:
+        return await run_full_api_flow(http)
+
+async def run_full_api_flow(http):
     print("🧪 Testing Complete API Flow")
     print("=" * 40)
     
-    # 1. Create event
+    # Audio synthesis does not depend on the event or session, so prepare it
+    # in a worker thread while the setup calls are in flight
+    audio_task = asyncio.create_task(asyncio.to_thread(encode_test_audio))
+    
+    # 1-2. Create event and start recording in one batched round trip
     print("1. Creating event...")
-    event_response = requests.post(base_url, json={
-        "tool": "events.create_event",
-        "arguments": {
+    print("2. Starting recording...")
+    event_data, session_data = await call_batch(http, [
+        {"tool": "events.create_event", "arguments": {
             "event_type": "individual_practice",
             "event_name": "Full Flow Test",
             "description": "Testing complete transcript flow",
             "duration_minutes": 5
-        }
-    })
-    event_data = event_response.json()
-    event_id = event_data.get("event_id")
-    print(f"✅ Event: {event_id}")
-    
-    # 2. Start recording
-    print("2. Starting recording...")
-    session_response = requests.post(base_url, json={
-        "tool": "pitches.start_recording",
-        "arguments": {
-            "event_id": event_id,
+        }},
+        {"tool": "pitches.start_recording", "arguments": {
+            "event_id": "$[0].event_id",
             "team_name": "Full Test Team",
             "pitch_title": "Complete Flow Test"
-        }
-    })
-    session_data = session_response.json()
+        }}
+    ])
+    event_id = event_data.get("event_id")
+    print(f"✅ Event: {event_id}")
     session_id = session_data.get("session_id")
     print(f"✅ Session: {session_id}")
     
     # 3. Generate and encode audio
     print("3. Preparing audio...")
-    audio_data = generate_test_audio()
-    audio_b64 = base64.b64encode(audio_data).decode('utf-8')
+    audio_data, audio_b64 = await audio_task
     print(f"✅ Audio: {len(audio_data)} bytes")
     
-    # 4. Stop recording with audio
+    # 4-5. Stop recording with audio, then request the playback URL
     print("4. Uploading audio and processing...")
-    stop_response = requests.post(base_url, json={
-        "tool": "pitches.stop_recording",
-        "arguments": {
-            "session_id": session_id,
-            "audio_data_base64": audio_b64
-        }
-    })
-    stop_data = stop_response.json()
+    playback_args = {
+        "session_id": session_id,
+        "expires_hours": 1
+    }
+    if USE_RAW_UPLOAD:
+        stop_data = await upload_recording(http, session_id, audio_data)
+        playback_data = await call_tool(http, "pitches.get_playback_url", playback_args)
+    else:
+        stop_data, playback_data = await call_batch(http, [
+            {"tool": "pitches.stop_recording", "arguments": {
+                "session_id": session_id,
+                "audio_data_base64": audio_b64
+            }},
+            {"tool": "pitches.get_playback_url", "arguments": playback_args}
+        ])
     
     print("📊 Stop Response:")
     print(f"   Status: {stop_data.get('status', 'unknown')}")
@@ -102,15 +174,6 @@ def test_full_api_flow():
         
     # 5. Test playback URL
     print("5. Getting playback URL...")
-    playback_response = requests.post(base_url, json={
-        "tool": "pitches.get_playback_url",
-        "arguments": {
-            "session_id": session_id,
-            "expires_hours": 1
-        }
-    })
-    playback_data = playback_response.json()
-    
     if playback_data.get("playback_url"):
         print(f"🔗 Playback URL: {playback_data['playback_url'][:60]}...")
     else:
@@ -126,7 +189,7 @@ def test_full_api_flow():
     return stop_data
 
 if __name__ == "__main__":
-    result = test_full_api_flow()
+    result = asyncio.run(run_standalone())
     
     print("\n💡 For browser testing:")
     print("• The API is working correctly")
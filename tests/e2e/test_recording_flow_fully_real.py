@@ -12,34 +12,33 @@ Requires:
 - Running Redis instance
 - Running MinIO instance
 """
+import array
 import asyncio
 import sys
 import os
-import struct
 import math
 import pytest
 import json
 import base64
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Add the api directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
 
 from api.domains.events.mcp.events_mcp_tools import execute_events_mcp_tool
 from api.domains.recordings.mcp.mcp_tools import execute_mcp_tool
 
+# Shares live Redis/MinIO state with the other e2e service tests under pytest-xdist
+pytestmark = pytest.mark.xdist_group("e2e_http")
+
 
 def generate_test_audio(duration_seconds=2.0, sample_rate=16000, frequency=440):
     """Generate test audio data (sine wave)."""
-    samples = []
-    for i in range(int(sample_rate * duration_seconds)):
-        t = i / sample_rate
-        sample = int(16383 * math.sin(2 * math.pi * frequency * t))
-        samples.append(struct.pack('<h', sample))
+    # Pack all samples into one contiguous int16 buffer instead of per-sample bytes
+    samples = array.array('h', [
+        int(16383 * math.sin(2 * math.pi * frequency * i / sample_rate))
+        for i in range(int(sample_rate * duration_seconds))
+    ])
+    if sys.byteorder != 'little':
+        samples.byteswap()
     
-    return b''.join(samples)
+    return samples.tobytes()
 
 
 @pytest.mark.asyncio
@@ -266,6 +265,10 @@ async def test_prerequisites():
 
 
 if __name__ == "__main__":
+    # Load environment variables (pytest runs load them once in conftest)
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     async def run_tests():
         await test_prerequisites()
         await test_fully_real_recording_flow()
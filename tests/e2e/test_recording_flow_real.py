@@ -11,40 +11,153 @@ Tests:
 3. Real STT session creation and management
 """
 import asyncio
-import sys
+import contextlib
+import functools
 import os
-import struct
-import math
 import pytest
+import numpy as np
 from unittest.mock import AsyncMock, patch
 import json
 import base64
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
-# Add the api directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from api.domains.events.mcp.events_mcp_tools import execute_events_mcp_tool
 from api.domains.recordings.mcp.mcp_tools import execute_mcp_tool
 from api.domains.recordings.mcp.gladia_mcp_handler import GladiaMCPHandler
 
 
+@functools.lru_cache(maxsize=8)
 def generate_test_audio(duration_seconds=2.0, sample_rate=16000, frequency=440):
     """Generate test audio data (sine wave)."""
-    samples = []
-    for i in range(int(sample_rate * duration_seconds)):
-        t = i / sample_rate
-        sample = int(16383 * math.sin(2 * math.pi * frequency * t))
-        samples.append(struct.pack('<h', sample))
+    t = np.arange(int(sample_rate * duration_seconds), dtype=np.float64) / sample_rate
+    samples = 16383 * np.sin(2 * np.pi * frequency * t)
     
-    return b''.join(samples)
+    return samples.astype('<i2').tobytes()
+
+
+@functools.lru_cache(maxsize=8)
+def _test_audio_b64(duration_seconds=2.0, sample_rate=16000, frequency=440):
+    """Return the base64 form of generate_test_audio, encoded once per set of parameters."""
+    return base64.b64encode(generate_test_audio(duration_seconds, sample_rate, frequency)).decode('ascii')
+
+
+@functools.lru_cache(maxsize=None)
+def _default_audio_config():
+    """Return the default AudioConfiguration, built once per process."""
+    from api.domains.recordings.value_objects.audio_configuration import AudioConfiguration
+    return AudioConfiguration.create_default()
+
+
+def dumps_json(obj):
+    """Serialize a mock Redis payload compactly, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def bind_redis_state(mock_redis_client):
+    """Back the mocked client's get/setex with one dict, like a real Redis keyspace.
+    
+    Tests seed or overwrite keys in the returned dict instead of reconfiguring
+    the mock for each step.
+    """
+    redis_state = {}
+    mock_redis_client.get.side_effect = redis_state.get
+    mock_redis_client.setex.side_effect = lambda key, ttl, value: redis_state.__setitem__(key, value) or True
+    return redis_state
+
+
+@contextlib.contextmanager
+def mocked_infra_context():
+    """Patch Redis (events and recordings) and MinIO once, yielding the wired mocks.
+    
+    Yields (mock_redis_client, mock_storage_instance, redis_state); the real
+    Gladia API is left untouched.
+    """
+    with contextlib.ExitStack() as stack:
+        mock_redis_module = stack.enter_context(patch('api.domains.events.mcp.events_mcp_handler.redis'))
+        # The events handler singleton caches its client; clear one left by an earlier test
+        stack.enter_context(patch('api.domains.events.mcp.events_mcp_handler.events_mcp_handler.redis_client', None))
+        mock_get_redis = stack.enter_context(patch('api.domains.recordings.mcp.gladia_mcp_handler.GladiaMCPHandler.get_redis'))
+        mock_minio = stack.enter_context(patch('api.domains.recordings.infrastructure.minio_audio_storage.MinIOAudioStorage'))
+        
+        mock_redis_client = AsyncMock()
+        mock_redis_module.from_url.return_value = mock_redis_client
+        mock_get_redis.return_value = mock_redis_client
+        redis_state = bind_redis_state(mock_redis_client)
+        
+        # Configure MinIO mock
+        mock_storage_instance = AsyncMock()
+        mock_minio.return_value = mock_storage_instance
+        mock_storage_instance.upload_audio.return_value = "sessions/test-session/recording.wav"
+        mock_storage_instance.get_playback_url.return_value = "https://minio.example.com/pitchscoop/sessions/test-session/recording.wav"
+        mock_storage_instance.get_audio_info.return_value = {
+            "size": 96000,
+            "content_type": "audio/wav", 
+            "object_key": "sessions/test-session/recording.wav"
+        }
+        
+        yield mock_redis_client, mock_storage_instance, redis_state
+
+
+@pytest.fixture
+def mocked_infra():
+    """Mocked Redis/MinIO infrastructure shared by the tests in this module."""
+    with mocked_infra_context() as infra:
+        yield infra
+
+
+async def _bootstrap_active_event(redis_state, name="Test Event", description="Test event"):
+    """Create and start a hackathon event, leaving it active with no sessions.
+    
+    Seeds the dict-backed Redis state between the steps and returns the event_id.
+    """
+    event_result = await execute_events_mcp_tool("events.create_event", {
+        "event_type": "hackathon",
+        "event_name": name,
+        "description": description,
+        "max_participants": 5,
+        "duration_minutes": 3
+    })
+    
+    assert "error" not in event_result
+    event_id = event_result["event_id"]
+    print(f"✅ Event created: {event_id}")
+    
+    # Start the event from its stored upcoming state
+    event_data = {
+        "event_id": event_id,
+        "event_name": name,
+        "event_type": "hackathon",
+        "status": "upcoming",
+        "duration_minutes": 3,
+        "max_participants": 5,
+        "created_at": "2024-01-01T10:00:00Z",
+        "start_time": "2025-01-01T10:00:00Z"
+    }
+    redis_state[f"event:{event_id}"] = dumps_json(event_data)
+    
+    start_result = await execute_events_mcp_tool("events.start_event", {
+        "event_id": event_id
+    })
+    
+    assert "error" not in start_result
+    print(f"✅ Event started: {start_result['status']}")
+    
+    # Update state to hold the active event with no sessions yet
+    event_data["status"] = "active"
+    redis_state[f"event:{event_id}"] = dumps_json(event_data)
+    redis_state[f"event:{event_id}:sessions"] = "[]"
+    
+    return event_id
 
 
 @pytest.mark.asyncio
-async def test_gladia_api_key_required():
+async def test_gladia_api_key_required(mocked_infra):
     """Test that the system properly validates Gladia API key requirement."""
     print("🔑 Testing Gladia API Key Validation")
     print("=" * 45)
@@ -54,71 +167,29 @@ async def test_gladia_api_key_required():
     if 'GLADIA_API_KEY' in os.environ:
         del os.environ['GLADIA_API_KEY']
     
+    _, _, redis_state = mocked_infra
+    
     try:
-        # Mock Redis for event operations only
-        with patch('domains.events.mcp.events_mcp_handler.redis') as mock_redis_module, \
-             patch('domains.recordings.mcp.gladia_mcp_handler.GladiaMCPHandler.get_redis') as mock_get_redis:
-            
-            mock_redis_client = AsyncMock()
-            mock_redis_module.from_url.return_value = mock_redis_client
-            mock_get_redis.return_value = mock_redis_client
-            
-            # Create and start an event first
-            mock_redis_client.get.return_value = None
-            mock_redis_client.setex.return_value = True
-            
-            event_result = await execute_events_mcp_tool("events.create_event", {
-                "event_type": "hackathon",
-                "event_name": "API Key Test Event", 
-                "description": "Test event for API key validation",
-                "max_participants": 5,
-                "duration_minutes": 3
-            })
-            
-            assert "error" not in event_result
-            event_id = event_result["event_id"]
-            
-            # Start the event
-            mock_event_data = {
-                "event_id": event_id,
-                "event_name": "API Key Test Event",
-                "event_type": "hackathon", 
-                "status": "upcoming",
-                "duration_minutes": 3,
-                "max_participants": 5,
-                "created_at": "2024-01-01T10:00:00Z",
-                "start_time": "2025-01-01T10:00:00Z"
-            }
-            mock_redis_client.get.return_value = json.dumps(mock_event_data)
-            
-            await execute_events_mcp_tool("events.start_event", {"event_id": event_id})
-            
-            # Update mock to return active event
-            active_event_data = mock_event_data.copy()
-            active_event_data["status"] = "active"
-            
-            def mock_redis_get(key):
-                if key == f"event:{event_id}":
-                    return json.dumps(active_event_data)
-                elif key == f"event:{event_id}:sessions":
-                    return json.dumps([])
-                return None
-                
-            mock_redis_client.get.side_effect = mock_redis_get
-            
-            # Now test recording start - should fail due to missing API key
-            print("Testing recording start without API key...")
-            recording_result = await execute_mcp_tool("pitches.start_recording", {
-                "event_id": event_id,
-                "team_name": "API Key Test Team",
-                "pitch_title": "Should Fail Without API Key"
-            })
-            
-            # Should return an error about missing API key
-            assert "error" in recording_result
-            assert "Gladia API key is required" in recording_result["error"]
-            print("✅ Correctly failed when API key missing")
-            
+        # Create and start an event first
+        event_id = await _bootstrap_active_event(
+            redis_state,
+            name="API Key Test Event",
+            description="Test event for API key validation"
+        )
+        
+        # Now test recording start - should fail due to missing API key
+        print("Testing recording start without API key...")
+        recording_result = await execute_mcp_tool("pitches.start_recording", {
+            "event_id": event_id,
+            "team_name": "API Key Test Team",
+            "pitch_title": "Should Fail Without API Key"
+        })
+        
+        # Should return an error about missing API key
+        assert "error" in recording_result
+        assert "Gladia API key is required" in recording_result["error"]
+        print("✅ Correctly failed when API key missing")
+        
     finally:
         # Restore the original API key
         if original_key:
@@ -126,7 +197,7 @@ async def test_gladia_api_key_required():
 
 
 @pytest.mark.asyncio 
-async def test_real_gladia_integration():
+async def test_real_gladia_integration(mocked_infra):
     """Test the complete recording flow with real Gladia API."""
     print("🚀 Testing Real Gladia Integration")
     print("=" * 40)
@@ -138,163 +209,93 @@ async def test_real_gladia_integration():
     
     print(f"Using Gladia API key: {api_key[:8]}...")
     
-    # Mock Redis and MinIO, but use real Gladia API  
-    with patch('domains.events.mcp.events_mcp_handler.redis') as mock_redis_module, \
-         patch('domains.recordings.mcp.gladia_mcp_handler.GladiaMCPHandler.get_redis') as mock_get_redis, \
-         patch('domains.recordings.infrastructure.minio_audio_storage.MinIOAudioStorage') as mock_minio:
+    # Redis and MinIO are mocked, but the Gladia API is real
+    mock_redis_client, _, redis_state = mocked_infra
+    
+    event_id = None
+    session_id = None
+    
+    try:
+        # Steps 1-2: Create and start event
+        print("\n1-2. Creating and starting event...")
+        event_id = await _bootstrap_active_event(
+            redis_state,
+            name="Real Gladia Test Event",
+            description="Test event with real Gladia integration"
+        )
         
-        mock_redis_client = AsyncMock()
-        mock_redis_module.from_url.return_value = mock_redis_client
-        mock_get_redis.return_value = mock_redis_client
+        # Step 3: Start recording with REAL Gladia API
+        print("\n3. Starting recording session with real Gladia API...")
         
-        # Configure MinIO mock
-        mock_storage_instance = AsyncMock()
-        mock_minio.return_value = mock_storage_instance
-        mock_storage_instance.upload_audio.return_value = "sessions/test-session/recording.wav"
-        mock_storage_instance.get_playback_url.return_value = "https://minio.example.com/pitchscoop/sessions/test-session/recording.wav"
-        mock_storage_instance.get_audio_info.return_value = {
-            "size": 96000,
-            "content_type": "audio/wav", 
-            "object_key": "sessions/test-session/recording.wav"
+        recording_result = await execute_mcp_tool("pitches.start_recording", {
+            "event_id": event_id,
+            "team_name": "Real Integration Test Team",
+            "pitch_title": "Testing Real Gladia STT Integration"
+        })
+        
+        # This should either succeed with real Gladia session or fail with specific error
+        if "error" in recording_result:
+            print(f"❌ Recording failed: {recording_result['error']}")
+            if "Gladia API" in recording_result["error"]:
+                print("This appears to be a Gladia API issue - check your API key and network")
+            pytest.fail(f"Failed to start recording with real Gladia API: {recording_result['error']}")
+        
+        session_id = recording_result["session_id"]
+        print(f"✅ Recording session started: {session_id}")
+        print(f"   Gladia Session ID: {recording_result.get('gladia_session_id', 'N/A')}")
+        print(f"   WebSocket URL: {recording_result.get('websocket_url', 'N/A')[:60]}...")
+        
+        # Verify we got real Gladia response (not mock)
+        assert recording_result.get("gladia_session_id") is not None
+        assert recording_result.get("websocket_url") is not None
+        assert "mock.gladia.io" not in recording_result.get("websocket_url", "")
+        print("✅ Confirmed real Gladia session created (not mock)")
+        
+        # Step 4: Test stopping recording
+        print("\n4. Testing recording stop...")
+        
+        # The handler knows this session's event from start_recording and
+        # reads the composite key directly, so no scan_iter result is needed
+        session_data = {
+            "session_id": session_id,
+            "event_id": event_id,
+            "team_name": "Real Integration Test Team",
+            "pitch_title": "Testing Real Gladia STT Integration",
+            "status": "ready_to_record",
+            "transcript_segments": []
         }
+        redis_state[f"event:{event_id}:session:{session_id}"] = dumps_json(session_data)
         
-        event_id = None
-        session_id = None
+        # Generate test audio; stop-recording only needs a small clip, so keep the
+        # base64 payload short unless overridden (read here, after .env is loaded)
+        duration_s = float(os.getenv("TEST_AUDIO_DURATION_S", "0.25"))
+        audio_b64 = _test_audio_b64(duration_s, 16000, 440)
         
-        try:
-            # Step 1: Create event
-            print("\n1. Creating event...")
-            mock_redis_client.get.return_value = None
-            mock_redis_client.setex.return_value = True
-            
-            event_result = await execute_events_mcp_tool("events.create_event", {
-                "event_type": "hackathon",
-                "event_name": "Real Gladia Test Event",
-                "description": "Test event with real Gladia integration", 
-                "max_participants": 5,
-                "duration_minutes": 3
-            })
-            
-            assert "error" not in event_result
-            event_id = event_result["event_id"]
-            print(f"✅ Event created: {event_id}")
-            
-            # Step 2: Start event  
-            print("\n2. Starting event...")
-            mock_event_data = {
-                "event_id": event_id,
-                "event_name": "Real Gladia Test Event",
-                "event_type": "hackathon",
-                "status": "upcoming",
-                "duration_minutes": 3,
-                "max_participants": 5,
-                "created_at": "2024-01-01T10:00:00Z",
-                "start_time": "2025-01-01T10:00:00Z"
-            }
-            mock_redis_client.get.return_value = json.dumps(mock_event_data)
-            
-            start_result = await execute_events_mcp_tool("events.start_event", {
-                "event_id": event_id
-            })
-            
-            assert "error" not in start_result
-            print(f"✅ Event started: {start_result['status']}")
-            
-            # Step 3: Start recording with REAL Gladia API
-            print("\n3. Starting recording session with real Gladia API...")
-            
-            active_event_data = mock_event_data.copy()
-            active_event_data["status"] = "active"
-            
-            def mock_redis_get(key):
-                if key == f"event:{event_id}":
-                    return json.dumps(active_event_data)
-                elif key == f"event:{event_id}:sessions":
-                    return json.dumps([])
-                return None
-                
-            mock_redis_client.get.side_effect = mock_redis_get
-            
-            recording_result = await execute_mcp_tool("pitches.start_recording", {
-                "event_id": event_id,
-                "team_name": "Real Integration Test Team",
-                "pitch_title": "Testing Real Gladia STT Integration"
-            })
-            
-            # This should either succeed with real Gladia session or fail with specific error
-            if "error" in recording_result:
-                print(f"❌ Recording failed: {recording_result['error']}")
-                if "Gladia API" in recording_result["error"]:
-                    print("This appears to be a Gladia API issue - check your API key and network")
-                pytest.fail(f"Failed to start recording with real Gladia API: {recording_result['error']}")
-            
-            session_id = recording_result["session_id"]
-            print(f"✅ Recording session started: {session_id}")
-            print(f"   Gladia Session ID: {recording_result.get('gladia_session_id', 'N/A')}")
-            print(f"   WebSocket URL: {recording_result.get('websocket_url', 'N/A')[:60]}...")
-            
-            # Verify we got real Gladia response (not mock)
-            assert recording_result.get("gladia_session_id") is not None
-            assert recording_result.get("websocket_url") is not None
-            assert "mock.gladia.io" not in recording_result.get("websocket_url", "")
-            print("✅ Confirmed real Gladia session created (not mock)")
-            
-            # Step 4: Test stopping recording
-            print("\n4. Testing recording stop...")
-            
-            # Mock session lookup for stop operation
-            class AsyncIterator:
-                def __init__(self, items):
-                    self.iter = iter(items)
-                    
-                def __aiter__(self):
-                    return self
-                    
-                async def __anext__(self):
-                    try:
-                        return next(self.iter)
-                    except StopIteration:
-                        raise StopAsyncIteration
-            
-            mock_redis_client.scan_iter.return_value = AsyncIterator([f"event:{event_id}:session:{session_id}"])
-            
-            session_data = {
-                "session_id": session_id,
-                "event_id": event_id,
-                "team_name": "Real Integration Test Team",
-                "pitch_title": "Testing Real Gladia STT Integration",
-                "status": "ready_to_record",
-                "transcript_segments": []
-            }
-            mock_redis_client.get.return_value = json.dumps(session_data)
-            
-            # Generate test audio
-            test_audio = generate_test_audio(duration_seconds=2.0, frequency=440)
-            audio_b64 = base64.b64encode(test_audio).decode('utf-8')
-            
-            stop_result = await execute_mcp_tool("pitches.stop_recording", {
-                "session_id": session_id,
-                "audio_data_base64": audio_b64
-            })
-            
-            if "error" in stop_result:
-                print(f"Stop recording result: {stop_result}")
-                # This might fail due to Redis/MinIO mocking, but we've proven Gladia integration works
-                print("⚠️  Stop recording failed (likely due to mocked Redis/MinIO), but Gladia session creation succeeded")
-            else:
-                print("✅ Recording stopped successfully")
-                
-            print("\n🎉 Real Gladia Integration Test Results:")
-            print("✅ API key properly loaded from .env file")
-            print("✅ Real Gladia STT session created successfully")  
-            print("✅ WebSocket URL received from Gladia API")
-            print("✅ Integration is working with real external service")
+        stop_result = await execute_mcp_tool("pitches.stop_recording", {
+            "session_id": session_id,
+            "audio_data_base64": audio_b64
+        })
+        
+        mock_redis_client.scan_iter.assert_not_called()
+        
+        if "error" in stop_result:
+            print(f"Stop recording result: {stop_result}")
+            # This might fail due to Redis/MinIO mocking, but we've proven Gladia integration works
+            print("⚠️  Stop recording failed (likely due to mocked Redis/MinIO), but Gladia session creation succeeded")
+        else:
+            print("✅ Recording stopped successfully")
             
-        except Exception as e:
-            print(f"\n❌ Real integration test failed: {e}")
-            import traceback
-            traceback.print_exc()
-            pytest.fail(f"Real Gladia integration test failed: {str(e)}")
+        print("\n🎉 Real Gladia Integration Test Results:")
+        print("✅ API key properly loaded from .env file")
+        print("✅ Real Gladia STT session created successfully")  
+        print("✅ WebSocket URL received from Gladia API")
+        print("✅ Integration is working with real external service")
+        
+    except Exception as e:
+        print(f"\n❌ Real integration test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        pytest.fail(f"Real Gladia integration test failed: {str(e)}")
 
 
 @pytest.mark.asyncio
@@ -307,10 +308,8 @@ async def test_gladia_session_creation_direct():
     if not api_key:
         pytest.skip("GLADIA_API_KEY not found - skipping direct API test")
     
-    from api.domains.recordings.value_objects.audio_configuration import AudioConfiguration
-    
     handler = GladiaMCPHandler()
-    config = AudioConfiguration.create_default()
+    config = _default_audio_config()
     
     print(f"Testing with API key: {api_key[:8]}...")
     print(f"Audio config: {config.to_gladia_config()}")
@@ -338,8 +337,14 @@ async def test_gladia_session_creation_direct():
 
 
 if __name__ == "__main__":
+    # Load environment variables (pytest runs load them once in conftest)
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     # Run the tests directly
     print("Running real Gladia integration tests...")
-    asyncio.run(test_gladia_api_key_required())
-    asyncio.run(test_real_gladia_integration()) 
+    with mocked_infra_context() as infra:
+        asyncio.run(test_gladia_api_key_required(infra))
+    with mocked_infra_context() as infra:
+        asyncio.run(test_real_gladia_integration(infra))
     asyncio.run(test_gladia_session_creation_direct())
\ No newline at end of file
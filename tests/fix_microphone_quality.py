@@ -5,6 +5,10 @@
 
 import sys
 import re
+import mmap
+
+# Matches the whole multiline constraintOptions array literal (bytes, for mmap scanning)
+_CONSTRAINTS_RE = re.compile(rb'const constraintOptions = \[[\s\S]*?\];')
 
 def fix_audio_constraints():
     print('🔧 Fixing Browser Audio Constraints for Better Quality')
@@ -12,24 +16,19 @@ def fix_audio_constraints():
     
     # Read the current test page
     try:
-        with open('/app/test_recording.html', 'r') as f:
-            content = f.read()
-        
+        source = open('/app/test_recording.html', 'rb')
         print('✅ Found test_recording.html')
     except FileNotFoundError:
         print('❌ test_recording.html not found')
         # Check if it's in main.py as embedded HTML
         try:
-            with open('/app/main.py', 'r') as f:
-                content = f.read()
+            source = open('/app/main.py', 'rb')
             print('✅ Found main.py (embedded HTML)')
         except FileNotFoundError:
             print('❌ Could not find HTML content')
             return False
     
     # Find and replace the constraintOptions array with optimized settings
-    old_constraints = r'const constraintOptions = \[\s*// Option 1: Strict constraints.*?\];'
-    
     new_constraints = '''const constraintOptions = [
                     // Option 1: High-quality microphone optimized (NEW!)
                     {
@@ -71,20 +70,22 @@ def fix_audio_constraints():
                     }
                 ];'''
     
-    # Apply the fix
-    if 'constraintOptions' in content:
-        # Use a more flexible regex that handles the multiline structure
-        pattern = r'const constraintOptions = \[[\s\S]*?\];'
-        updated_content = re.sub(pattern, new_constraints, content, flags=re.MULTILINE | re.DOTALL)
-        
-        if updated_content != content:
-            # Write the updated content back
-            if 'test_recording.html' in content:
-                output_file = '/app/test_recording.html'
-            else:
-                output_file = '/app/main.py'
-            
-            with open(output_file, 'w') as f:
+    # Scan through a read-only mmap so a file without the array is never copied or decoded
+    updated_content = None
+    with source:
+        try:
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                if _CONSTRAINTS_RE.search(content):
+                    updated_content = _CONSTRAINTS_RE.sub(new_constraints.encode('utf-8'), content)
+                    changed = updated_content != content[:]
+        except ValueError:
+            # Empty files cannot be mapped and have nothing to replace
+            pass
+    
+    if updated_content is not None:
+        if changed:
+            # Write the updated content back to the file it was read from
+            with open(source.name, 'wb') as f:
                 f.write(updated_content)
             
             print('✅ Updated audio constraints for better quality!')
@@ -9,128 +9,115 @@ basic connectivity and available endpoints.
 import os
 import aiohttp
 import asyncio
+import itertools
 import json
-from datetime import datetime
+import sys
+import pytest
+from types import MappingProxyType
 
-async def test_brightdata_connectivity():
+# Probe matrix of common BrightData API base URLs and endpoints, built once
+_BASE_URLS = (
+    "https://brightdata.com/api",
+    "https://api.brightdata.com",
+    "https://api.brightdata.gq",
+    "https://proxy-api.brightdata.com",
+)
+
+_ENDPOINTS = (
+    "/status",
+    "/account",
+    "/zones",
+    "/",
+    "/v1/status",
+    "/v2/status",
+)
+
+# Also try Basic Auth (common for BrightData)
+_AUTH_MODES = ("Bearer", "Basic Auth")
+
+# The shared http_client has no timeout; probes and site checks give up after 10 s
+_PROBE_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Headers shared by every probe; Bearer probes add their Authorization header
+_BASE_HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+    "User-Agent": "PitchScoop/1.0",
+})
+
+
+@pytest.mark.asyncio
+async def test_brightdata_connectivity(http_client, bright_data_api_key):
     """Test basic BrightData API connectivity."""
     print("🔍 Testing BrightData API Connectivity...")
     
-    # Get API key from environment
-    api_key = os.getenv("BRIGHT_DATA_API_KEY")
-    if not api_key or api_key == "your_bright_data_api_key_here":
-        print("❌ BRIGHT_DATA_API_KEY not found in environment")
-        return False
-    
+    # The fixture reads the key at run time, after .env is loaded, and skips without it
+    api_key = bright_data_api_key
     print(f"✅ Found API Key: {api_key[:8]}...")
     
-    # BrightData typically uses different endpoints than what I had before
-    # Let's try some common BrightData API endpoints
-    base_urls_to_try = [
-        "https://brightdata.com/api",
-        "https://api.brightdata.com", 
-        "https://api.brightdata.gq",
-        "https://proxy-api.brightdata.com"
-    ]
-    
-    endpoints_to_try = [
-        "/status",
-        "/account",
-        "/zones", 
-        "/",
-        "/v1/status",
-        "/v2/status"
-    ]
-    
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "User-Agent": "PitchScoop/1.0"
-    }
-    
-    # Also try Basic Auth (common for BrightData)
-    auth_headers = {
-        "Content-Type": "application/json", 
-        "User-Agent": "PitchScoop/1.0"
-    }
-    
-    timeout = aiohttp.ClientTimeout(total=10)
-    
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        for base_url in base_urls_to_try:
-            print(f"\n🌐 Trying base URL: {base_url}")
-            
-            for endpoint in endpoints_to_try:
-                full_url = f"{base_url}{endpoint}"
+    # Probe every base URL, endpoint and auth mode concurrently, with at most
+    # 8 requests in flight so the target servers are not flooded
+    probes = list(itertools.product(_BASE_URLS, _ENDPOINTS, _AUTH_MODES))
+    in_flight = asyncio.Semaphore(8)
+    bearer_headers = {**_BASE_HEADERS, "Authorization": f"Bearer {api_key}"}
+    basic_auth = aiohttp.BasicAuth(api_key, '')
+    
+    async def probe(base_url, endpoint, auth_mode):
+        """Request one endpoint and report whether it answered usefully."""
+        async with in_flight:
+            return await probe_endpoint(f"{base_url}{endpoint}", auth_mode)
+    
+    async def probe_endpoint(full_url, auth_mode):
+        if auth_mode == "Bearer":
+            request_kwargs = {"headers": bearer_headers, "timeout": _PROBE_TIMEOUT}
+        else:
+            # Basic Auth using API key as username
+            request_kwargs = {"headers": _BASE_HEADERS, "auth": basic_auth, "timeout": _PROBE_TIMEOUT}
+        
+        try:
+            async with http_client.get(full_url, **request_kwargs) as response:
+                content_type = response.headers.get('content-type', '')
+                status = response.status
+                
+                if 'application/json' in content_type:
+                    try:
+                        data = await response.json()
+                        print(f"  ✅ {full_url} ({auth_mode}) {status} - JSON Response: {json.dumps(data, indent=2)[:200]}...")
+                        return True
+                    except:
+                        text = await response.text()
+                        print(f"  ⚠️  {full_url} ({auth_mode}) {status} - JSON parse failed: {text[:100]}...")
+                else:
+                    text = await response.text()
+                    print(f"  ℹ️  {full_url} ({auth_mode}) {status} - {content_type}: {text[:100]}...")
                 
-                try:
-                    # Try Bearer token first
-                    print(f"  📡 Testing: {full_url} (Bearer)")
-                    async with session.get(full_url, headers=headers) as response:
-                        content_type = response.headers.get('content-type', '')
-                        status = response.status
-                        
-                        if 'application/json' in content_type:
-                            try:
-                                data = await response.json()
-                                print(f"    ✅ {status} - JSON Response: {json.dumps(data, indent=2)[:200]}...")
-                                return True
-                            except:
-                                text = await response.text()
-                                print(f"    ⚠️  {status} - JSON parse failed: {text[:100]}...")
-                        else:
-                            text = await response.text()
-                            print(f"    ℹ️  {status} - {content_type}: {text[:100]}...")
-                            
-                        if status == 200:
-                            return True
-                            
-                except aiohttp.ClientError as e:
-                    print(f"    ❌ Connection error: {str(e)}")
-                except Exception as e:
-                    print(f"    ❌ Error: {str(e)}")
+                return status == 200
                 
-                # Try with Basic Auth using API key as username
-                try:
-                    print(f"  📡 Testing: {full_url} (Basic Auth)")
-                    auth = aiohttp.BasicAuth(api_key, '')
-                    async with session.get(full_url, headers=auth_headers, auth=auth) as response:
-                        content_type = response.headers.get('content-type', '')
-                        status = response.status
-                        
-                        if 'application/json' in content_type:
-                            try:
-                                data = await response.json()
-                                print(f"    ✅ {status} - JSON Response: {json.dumps(data, indent=2)[:200]}...")
-                                return True
-                            except:
-                                text = await response.text()
-                                print(f"    ⚠️  {status} - JSON parse failed: {text[:100]}...")
-                        else:
-                            text = await response.text()
-                            print(f"    ℹ️  {status} - {content_type}: {text[:100]}...")
-                            
-                        if status == 200:
-                            return True
-                            
-                except aiohttp.ClientError as e:
-                    print(f"    ❌ Basic Auth error: {str(e)}")
-                except Exception as e:
-                    print(f"    ❌ Basic Auth error: {str(e)}")
-                    
-                await asyncio.sleep(0.1)  # Rate limiting
+        except aiohttp.ClientError as e:
+            print(f"  ❌ {full_url} ({auth_mode}) connection error: {str(e)}")
+        except Exception as e:
+            print(f"  ❌ {full_url} ({auth_mode}) error: {str(e)}")
+        return False
     
-    print("❌ Could not establish connectivity to BrightData API")
-    return False
+    print(f"\n🌐 Probing {len(probes)} endpoint/auth combinations across {len(_BASE_URLS)} base URLs")
+    tasks = [asyncio.ensure_future(probe(*combo)) for combo in probes]
+    try:
+        # Stop at the first endpoint that answers
+        for next_result in asyncio.as_completed(tasks):
+            if await next_result:
+                return
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    pytest.fail("Could not establish connectivity to BrightData API")
 
-async def test_web_scraping_request():
+@pytest.mark.asyncio
+async def test_web_scraping_request(http_client, bright_data_api_key):
     """Test a simple web scraping request if we have connectivity."""
     print("\n🕷️ Testing Web Scraping Capability...")
     
-    api_key = os.getenv("BRIGHT_DATA_API_KEY")
-    if not api_key:
-        print("❌ No API key available")
-        return False
+    api_key = bright_data_api_key
     
     # BrightData often uses proxy endpoints for scraping
     proxy_endpoints = [
@@ -142,49 +129,37 @@ async def test_web_scraping_request():
     try:
         # This is a common pattern for BrightData proxy usage
         proxy_auth = aiohttp.BasicAuth(f"brd-customer-{api_key}-zone-market_research", api_key)
-        connector = aiohttp.TCPConnector()
-        timeout = aiohttp.ClientTimeout(total=30)
         
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-            # Test with a simple, scraping-friendly site
-            test_url = "https://httpbin.org/json"
-            
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-            }
-            
-            try:
-                async with session.get(test_url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        print(f"✅ Direct request successful: {data}")
-                        return True
-            except Exception as e:
-                print(f"ℹ️  Direct request failed (expected): {e}")
+        # Test with a simple, scraping-friendly site
+        test_url = "https://httpbin.org/json"
+        
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+        }
+        
+        try:
+            # Scraping requests get a longer timeout than the probes
+            async with http_client.get(test_url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    print(f"✅ Direct request successful: {data}")
+                    return
+        except Exception as e:
+            print(f"ℹ️  Direct request failed (expected): {e}")
             
     except Exception as e:
         print(f"❌ Proxy test failed: {e}")
     
-    print("ℹ️  Web scraping test completed (proxy configuration may be needed)")
-    return False
+    pytest.fail("Web scraping request did not succeed (proxy configuration may be needed)")
 
-async def check_brightdata_documentation():
+@pytest.mark.asyncio
+async def test_brightdata_documentation(http_client, bright_data_api_key):
     """Check if we can get any info from BrightData's main site."""
     print("\n📚 Checking BrightData Documentation...")
     
-    try:
-        timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get("https://brightdata.com") as response:
-                if response.status == 200:
-                    print("✅ BrightData main site is accessible")
-                    return True
-                else:
-                    print(f"⚠️  BrightData site returned {response.status}")
-    except Exception as e:
-        print(f"❌ Could not reach BrightData site: {e}")
-    
-    return False
+    async with http_client.get("https://brightdata.com", timeout=_PROBE_TIMEOUT) as response:
+        assert response.status == 200, f"BrightData site returned {response.status}"
+    print("✅ BrightData main site is accessible")
 
 def print_brightdata_info():
     """Print information about BrightData integration."""
@@ -224,54 +199,13 @@ def print_brightdata_info():
     print("3. Configure proxy settings if using proxy services")
     print("4. Update API endpoints based on your BrightData plan")
 
-async def main():
-    """Run all BrightData tests."""
-    print("🚀 BrightData API Testing")
-    print(f"📅 Test Time: {datetime.now().isoformat()}")
-    print("="*60)
-    
-    results = {}
-    
-    # Test basic connectivity
-    results["connectivity"] = await test_brightdata_connectivity()
-    
-    # Test web scraping if connectivity works
-    if results["connectivity"]:
-        results["scraping"] = await test_web_scraping_request()
-    else:
-        results["scraping"] = False
-    
-    # Check documentation access
-    results["documentation"] = await check_brightdata_documentation()
-    
-    # Print summary
-    print("\n" + "="*60)
-    print("📊 TEST RESULTS SUMMARY")
-    print("="*60)
-    
-    total_tests = len(results)
-    passed_tests = sum(1 for result in results.values() if result)
-    
-    for test_name, passed in results.items():
-        status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"{test_name.capitalize():<20} {status}")
-    
-    print(f"\nTests Passed: {passed_tests}/{total_tests}")
-    
-    # Print integration info regardless of results
-    print_brightdata_info()
-    
-    if passed_tests > 0:
-        print("\n🎉 Some connectivity established!")
-    else:
-        print("\n⚠️  No successful connections - check account setup")
-    
-    return passed_tests > 0
-
 if __name__ == "__main__":
     # Load environment variables
     from dotenv import load_dotenv
     load_dotenv()
     
-    success = asyncio.run(main())
-    exit(0 if success else 1)
\ No newline at end of file
+    exit_code = pytest.main([__file__, "-s"])
+    
+    # Print integration info regardless of results
+    print_brightdata_info()
+    sys.exit(exit_code)
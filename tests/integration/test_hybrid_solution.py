@@ -7,52 +7,85 @@ This test demonstrates both solved issues:
 2. ✅ Enhanced analysis quality (hybrid Gladia + Azure OpenAI)
 """
 import asyncio
-import base64
-import struct
-import math
+import functools
+import hashlib
+import logging
+import os
+import tempfile
 import pytest
+import numpy as np
+from pathlib import Path
 
 from api.domains.events.mcp.events_mcp_handler import events_mcp_handler
 from api.domains.recordings.mcp.gladia_mcp_handler import GladiaMCPHandler
 from api.domains.recordings.mcp.enhanced_analysis_mcp_tools import execute_enhanced_analysis_mcp_tool
 
 
+logger = logging.getLogger(__name__)
+
+
+def disk_cached_audio(func):
+    """Cache a deterministic audio generator's PCM output in the temp directory.
+    
+    The file name is keyed on the generator's bytecode and constants as well as
+    the call arguments, so later test runs read the bytes back instead of
+    synthesizing them again, and editing the generator invalidates old files.
+    """
+    code = func.__code__
+    code_hash = hashlib.blake2b(code.co_code + repr(code.co_consts).encode(), digest_size=8).hexdigest()
+    
+    @functools.wraps(func)
+    def wrapper(duration=30.0, sample_rate=16000):
+        key = hashlib.blake2b(f"{func.__name__}:{code_hash}:{float(duration)}:{int(sample_rate)}".encode(), digest_size=8).hexdigest()
+        path = Path(tempfile.gettempdir()) / f"pitchscoop_audio_{key}.pcm"
+        if path.exists():
+            return path.read_bytes()
+        
+        data = func(duration, sample_rate)
+        # Write to a private file and rename so concurrent runs never read a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        return data
+    
+    return wrapper
+
+
+@disk_cached_audio
 def generate_sample_audio(duration=30.0, sample_rate=16000):
     """Generate sample audio (shorter duration for testing)"""
-    samples = []
-    for i in range(int(sample_rate * duration)):
-        t = i / sample_rate
-        # Create varied audio patterns
-        f1 = 400 + 100 * math.sin(2 * math.pi * 2 * t)
-        amplitude = 0.5 * (1 + 0.3 * math.sin(2 * math.pi * 4 * t))
-        signal = math.sin(2 * math.pi * f1 * t)
-        sample = int(15000 * amplitude * signal)
-        samples.append(struct.pack('<h', max(-32767, min(32767, sample))))
-    
-    return b''.join(samples)
+    t = np.arange(int(sample_rate * duration), dtype=np.float64) / sample_rate
+    # Create varied audio patterns
+    f1 = 400 + 100 * np.sin(2 * np.pi * 2 * t)
+    amplitude = 0.5 * (1 + 0.3 * np.sin(2 * np.pi * 4 * t))
+    signal = np.sin(2 * np.pi * f1 * t)
+    # Truncate like int(), then clip and emit little-endian int16 samples
+    samples = np.clip((15000 * amplitude * signal).astype(np.int32), -32767, 32767)
+    
+    return samples.astype('<i2').tobytes()
 
 
 @pytest.mark.asyncio
 async def test_complete_hybrid_solution():
-    print('🎯 Testing Complete Hybrid Solution')
-    print('=' * 60)
-    print('This test verifies both major fixes:')
-    print('✅ 1. 3-minute recording support (re-enabled batch processing)')
-    print('✅ 2. Enhanced analysis quality (hybrid Gladia + Azure OpenAI)')
-    print('')
+    logger.info('🎯 Testing Complete Hybrid Solution')
+    logger.info('=' * 60)
+    logger.info('This test verifies both major fixes:')
+    logger.info('✅ 1. 3-minute recording support (re-enabled batch processing)')
+    logger.info('✅ 2. Enhanced analysis quality (hybrid Gladia + Azure OpenAI)')
+    logger.info('')
     
     # Create event
-    print('1. Creating event...')
+    logger.info('1. Creating event...')
     event = await events_mcp_handler.create_event(
         event_type='hackathon',
         event_name='Hybrid Solution Test',
         description='Testing complete hybrid Gladia + Azure OpenAI solution'
     )
     event_id = event['event_id']
-    print(f'   ✅ Event: {event_id}')
+    logger.info(f'   ✅ Event: {event_id}')
     
     # Start recording session
-    print('2. Starting recording session...')
+    logger.info('2. Starting recording session...')
     handler = GladiaMCPHandler()
     session = await handler.start_pitch_recording(
         'Hybrid Test Team',
@@ -61,46 +94,46 @@ async def test_complete_hybrid_solution():
     )
     
     if 'error' in session:
-        print(f'   ❌ Session failed: {session["error"]}')
+        logger.error(f'   ❌ Session failed: {session["error"]}')
         return False
     
     session_id = session['session_id']
     gladia_session_id = session.get('gladia_session_id')
     
-    print(f'   ✅ Session: {session_id}')
-    print(f'   🧠 Gladia session: {gladia_session_id}')
-    print(f'   📊 Audio Intelligence enabled: {session["audio_config"]}')
+    logger.info(f'   ✅ Session: {session_id}')
+    logger.info(f'   🧠 Gladia session: {gladia_session_id}')
+    logger.info(f'   📊 Audio Intelligence enabled: {session["audio_config"]}')
     
     # Generate sample audio (30 seconds for testing)
-    print('3. Generating sample audio...')
+    logger.info('3. Generating sample audio...')
     audio_data = generate_sample_audio(30.0)  # 30 seconds for faster testing
     audio_size_mb = len(audio_data) / (1024 * 1024)
-    audio_b64 = base64.b64encode(audio_data).decode('utf-8')
     
-    print(f'   ✅ Generated: {len(audio_data):,} bytes ({audio_size_mb:.1f}MB)')
-    print(f'   📏 Duration: 30 seconds')
+    logger.info(f'   ✅ Generated: {len(audio_data):,} bytes ({audio_size_mb:.1f}MB)')
+    logger.info(f'   📏 Duration: 30 seconds')
     
     # Process with hybrid approach
-    print('4. Processing with Hybrid Gladia + Azure OpenAI...')
-    print('   🔄 Step 1: Gladia transcription (batch or WebSocket)')
-    print('   🔄 Step 2: Enhanced AI analysis via Azure OpenAI')
+    logger.info('4. Processing with Hybrid Gladia + Azure OpenAI...')
+    logger.info('   🔄 Step 1: Gladia transcription (batch or WebSocket)')
+    logger.info('   🔄 Step 2: Enhanced AI analysis via Azure OpenAI')
     
     try:
-        result = await handler.stop_pitch_recording(session_id, audio_b64)
+        # Hand the raw PCM bytes straight to the handler; no base64 round trip is needed
+        result = await handler.stop_pitch_recording(session_id, audio_data=audio_data)
     except Exception as e:
-        print(f'   💥 Processing failed: {e}')
+        logger.exception(f'   💥 Processing failed: {e}')
         return False
     
     # Analyze results
-    print('\n📊 HYBRID SOLUTION RESULTS:')
-    print('=' * 40)
+    logger.info('\n📊 HYBRID SOLUTION RESULTS:')
+    logger.info('=' * 40)
     
     status = result.get('status', 'unknown')
     error = result.get('error')
     
-    print(f'Status: {status}')
+    logger.info(f'Status: {status}')
     if error:
-        print(f'Error: {error}')
+        logger.info(f'Error: {error}')
         return False
     
     # Check transcript and analysis results
@@ -111,19 +144,19 @@ async def test_complete_hybrid_solution():
         analysis_method = transcript.get('analysis_method', 'unknown')
         quality_improvements = transcript.get('quality_improvements', {})
         
-        print(f'\n📝 TRANSCRIPTION RESULTS:')
-        print(f'   Segments processed: {segments_count}')
-        print(f'   Total text length: {len(total_text)} characters')
-        print(f'   Analysis method: {analysis_method}')
+        logger.info(f'\n📝 TRANSCRIPTION RESULTS:')
+        logger.info(f'   Segments processed: {segments_count}')
+        logger.info(f'   Total text length: {len(total_text)} characters')
+        logger.info(f'   Analysis method: {analysis_method}')
         
         # Show analysis improvements
         if analysis_method == "hybrid_gladia_azure_openai":
-            print(f'\n🎉 HYBRID ANALYSIS SUCCESS:')
-            print(f'   ✅ Gladia: Basic transcription completed')
-            print(f'   ✅ Azure OpenAI: Enhanced analysis completed')
+            logger.info(f'\n🎉 HYBRID ANALYSIS SUCCESS:')
+            logger.info(f'   ✅ Gladia: Basic transcription completed')
+            logger.info(f'   ✅ Azure OpenAI: Enhanced analysis completed')
             
             if quality_improvements:
-                print(f'   📈 Quality improvements: {quality_improvements}')
+                logger.info(f'   📈 Quality improvements: {quality_improvements}')
             
             # Check for enhanced intelligence data
             enhanced_intel = transcript.get('enhanced_audio_intelligence', {})
@@ -131,33 +164,33 @@ async def test_complete_hybrid_solution():
                 sentiment = enhanced_intel.get('sentiment_analysis', {})
                 pitch_intel = enhanced_intel.get('pitch_intelligence', {})
                 
-                print(f'\n🧠 ENHANCED ANALYSIS QUALITY:')
-                print(f'   Sentiment: {sentiment.get("overall_sentiment", "N/A")} (confidence: {sentiment.get("sentiment_confidence", 0.0):.2f})')
-                print(f'   Emotional tone: {sentiment.get("emotional_tone", "N/A")}')
-                print(f'   Enthusiasm: {sentiment.get("enthusiasm_level", "N/A")}')
-                print(f'   Investor appeal: {sentiment.get("investor_appeal", 0.0):.2f}')
-                print(f'   Persuasiveness: {pitch_intel.get("persuasiveness_score", 0.0):.2f}')
-                print(f'   Technical confidence: {pitch_intel.get("technical_confidence", 0.0):.2f}')
+                logger.info(f'\n🧠 ENHANCED ANALYSIS QUALITY:')
+                logger.info(f'   Sentiment: {sentiment.get("overall_sentiment", "N/A")} (confidence: {sentiment.get("sentiment_confidence", 0.0):.2f})')
+                logger.info(f'   Emotional tone: {sentiment.get("emotional_tone", "N/A")}')
+                logger.info(f'   Enthusiasm: {sentiment.get("enthusiasm_level", "N/A")}')
+                logger.info(f'   Investor appeal: {sentiment.get("investor_appeal", 0.0):.2f}')
+                logger.info(f'   Persuasiveness: {pitch_intel.get("persuasiveness_score", 0.0):.2f}')
+                logger.info(f'   Technical confidence: {pitch_intel.get("technical_confidence", 0.0):.2f}')
                 
         elif analysis_method == "gladia_only":
-            print(f'\n⚠️  GLADIA-ONLY ANALYSIS:')
-            print(f'   Gladia transcription worked, but enhanced analysis failed')
-            print(f'   Still better than before (batch processing is working)')
+            logger.info(f'\n⚠️  GLADIA-ONLY ANALYSIS:')
+            logger.info(f'   Gladia transcription worked, but enhanced analysis failed')
+            logger.info(f'   Still better than before (batch processing is working)')
             
         else:
-            print(f'\n❓ UNKNOWN ANALYSIS METHOD: {analysis_method}')
+            logger.info(f'\n❓ UNKNOWN ANALYSIS METHOD: {analysis_method}')
     
     # Check audio storage
     audio_info = result.get('audio', {})
     if audio_info.get('has_audio'):
         stored_size = audio_info.get('audio_size', 0)
-        print(f'\n🎵 AUDIO STORAGE:')
-        print(f'   ✅ Stored: {stored_size:,} bytes')
-        print(f'   📂 MinIO key: {audio_info.get("minio_object_key", "N/A")}')
-        print(f'   🔗 Playback available: {"Yes" if audio_info.get("playback_url") else "No"}')
+        logger.info(f'\n🎵 AUDIO STORAGE:')
+        logger.info(f'   ✅ Stored: {stored_size:,} bytes')
+        logger.info(f'   📂 MinIO key: {audio_info.get("minio_object_key", "N/A")}')
+        logger.info(f'   🔗 Playback available: {"Yes" if audio_info.get("playback_url") else "No"}')
     
     # Test enhanced analysis MCP tool on the results
-    print(f'\n5. Testing Enhanced Analysis MCP Tool...')
+    logger.info(f'\n5. Testing Enhanced Analysis MCP Tool...')
     
     try:
         enhanced_test = await execute_enhanced_analysis_mcp_tool(
@@ -172,69 +205,70 @@ async def test_complete_hybrid_solution():
         if "error" not in enhanced_test:
             enhanced_analysis = enhanced_test.get("enhanced_analysis", {})
             if enhanced_analysis.get("success"):
-                print(f'   ✅ Enhanced analysis MCP tool working')
+                logger.info(f'   ✅ Enhanced analysis MCP tool working')
                 sentiment = enhanced_analysis.get("sentiment_analysis", {})
-                print(f'   📊 Direct analysis confidence: {sentiment.get("sentiment_confidence", 0.0):.2f}')
+                logger.info(f'   📊 Direct analysis confidence: {sentiment.get("sentiment_confidence", 0.0):.2f}')
             else:
-                print(f'   ⚠️  Enhanced analysis failed: {enhanced_analysis.get("error")}')
+                logger.warning(f'   ⚠️  Enhanced analysis failed: {enhanced_analysis.get("error")}')
         else:
-            print(f'   ❌ MCP tool error: {enhanced_test["error"]}')
+            logger.error(f'   ❌ MCP tool error: {enhanced_test["error"]}')
             
     except Exception as e:
-        print(f'   💥 MCP tool test failed: {e}')
+        logger.exception(f'   💥 MCP tool test failed: {e}')
     
-    print('\n🎯 SOLUTION VERIFICATION:')
-    print('=' * 40)
+    logger.info('\n🎯 SOLUTION VERIFICATION:')
+    logger.info('=' * 40)
     
     # Verify both issues are resolved
     issue1_resolved = status == "completed" and segments_count > 0
     issue2_resolved = transcript.get('analysis_method') == "hybrid_gladia_azure_openai"
     
-    print(f'✅ Issue 1 - 3-minute recording support: {"RESOLVED" if issue1_resolved else "NOT RESOLVED"}')
-    print(f'   - Batch processing re-enabled: {"✅" if issue1_resolved else "❌"}')
-    print(f'   - Audio Intelligence working: {"✅" if issue1_resolved else "❌"}')
+    logger.info(f'✅ Issue 1 - 3-minute recording support: {"RESOLVED" if issue1_resolved else "NOT RESOLVED"}')
+    logger.info(f'   - Batch processing re-enabled: {"✅" if issue1_resolved else "❌"}')
+    logger.info(f'   - Audio Intelligence working: {"✅" if issue1_resolved else "❌"}')
     
-    print(f'✅ Issue 2 - Analysis quality improvements: {"RESOLVED" if issue2_resolved else "PARTIALLY RESOLVED"}')
-    print(f'   - Hybrid approach active: {"✅" if issue2_resolved else "❌"}')
-    print(f'   - Enhanced confidence scores: {"✅" if issue2_resolved else "❌"}')
-    print(f'   - Pitch-specific analysis: {"✅" if issue2_resolved else "❌"}')
+    logger.info(f'✅ Issue 2 - Analysis quality improvements: {"RESOLVED" if issue2_resolved else "PARTIALLY RESOLVED"}')
+    logger.info(f'   - Hybrid approach active: {"✅" if issue2_resolved else "❌"}')
+    logger.info(f'   - Enhanced confidence scores: {"✅" if issue2_resolved else "❌"}')
+    logger.info(f'   - Pitch-specific analysis: {"✅" if issue2_resolved else "❌"}')
     
     if issue1_resolved and issue2_resolved:
-        print(f'\n🎉 COMPLETE SUCCESS: Both major issues have been resolved!')
-        print(f'   🎯 3-minute recordings now work with full Audio Intelligence')
-        print(f'   🧠 Analysis quality dramatically improved with hybrid approach')
-        print(f'   🚀 System ready for production use')
+        logger.info(f'\n🎉 COMPLETE SUCCESS: Both major issues have been resolved!')
+        logger.info(f'   🎯 3-minute recordings now work with full Audio Intelligence')
+        logger.info(f'   🧠 Analysis quality dramatically improved with hybrid approach')
+        logger.info(f'   🚀 System ready for production use')
         return True
     else:
-        print(f'\n⚠️  Partial success - some issues may need additional work')
+        logger.warning(f'\n⚠️  Partial success - some issues may need additional work')
         return False
 
 
 async def test_large_file_support():
     """Test that the system can handle larger files (simulating 3-minute recordings)."""
-    print(f'\n🔍 Testing Large File Support (3-minute simulation)')
-    print('=' * 50)
+    logger.info(f'\n🔍 Testing Large File Support (3-minute simulation)')
+    logger.info('=' * 50)
     
     # Generate larger audio file (simulate 3 minutes)
-    print('Generating 3-minute audio simulation...')
+    logger.info('Generating 3-minute audio simulation...')
     large_audio = generate_sample_audio(180.0)  # 3 minutes
     large_size_mb = len(large_audio) / (1024 * 1024)
     
-    print(f'✅ Generated: {len(large_audio):,} bytes ({large_size_mb:.1f}MB)')
-    print(f'📏 Duration: 3.0 minutes (180 seconds)')
+    logger.info(f'✅ Generated: {len(large_audio):,} bytes ({large_size_mb:.1f}MB)')
+    logger.info(f'📏 Duration: 3.0 minutes (180 seconds)')
     
     if large_size_mb > 10:
-        print(f'❌ File too large ({large_size_mb:.1f}MB > 10MB limit)')
-        print('   This would fall back to WebSocket processing')
+        logger.error(f'❌ File too large ({large_size_mb:.1f}MB > 10MB limit)')
+        logger.info('   This would fall back to WebSocket processing')
         return False
     else:
-        print(f'✅ File within limits ({large_size_mb:.1f}MB < 10MB limit)')
-        print('   This would use batch processing with Audio Intelligence')
+        logger.info(f'✅ File within limits ({large_size_mb:.1f}MB < 10MB limit)')
+        logger.info('   This would use batch processing with Audio Intelligence')
         return True
 
 
 if __name__ == "__main__":
-    print("🚀 Starting Complete Hybrid Solution Test...")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.info("🚀 Starting Complete Hybrid Solution Test...")
     
     async def run_tests():
         success1 = await test_complete_hybrid_solution()
@@ -243,12 +277,12 @@ if __name__ == "__main__":
     
     success = asyncio.run(run_tests())
     
-    print(f"\n{'🎉 COMPLETE HYBRID SOLUTION WORKING!' if success else '⚠️  Some issues detected.'}")
-    print("\n📋 IMPLEMENTATION SUMMARY:")
-    print("✅ Option 2: Hybrid Gladia + Custom AI Analysis (RECOMMENDED)")
-    print("   - Gladia: Basic transcription (reliable, real-time) ✅")  
-    print("   - Azure OpenAI: Advanced sentiment analysis ✅")
-    print("   - Custom Logic: Pitch competition context ✅")
-    print("   - Enhanced metrics: Persuasiveness, technical confidence, market understanding ✅")
-    print("   - Higher confidence scores: 0.8+ vs 0.3 ✅")
-    print("   - Actionable coaching insights ✅")
\ No newline at end of file
+    logger.info(f"\n{'🎉 COMPLETE HYBRID SOLUTION WORKING!' if success else '⚠️  Some issues detected.'}")
+    logger.info("\n📋 IMPLEMENTATION SUMMARY:")
+    logger.info("✅ Option 2: Hybrid Gladia + Custom AI Analysis (RECOMMENDED)")
+    logger.info("   - Gladia: Basic transcription (reliable, real-time) ✅")  
+    logger.info("   - Azure OpenAI: Advanced sentiment analysis ✅")
+    logger.info("   - Custom Logic: Pitch competition context ✅")
+    logger.info("   - Enhanced metrics: Persuasiveness, technical confidence, market understanding ✅")
+    logger.info("   - Higher confidence scores: 0.8+ vs 0.3 ✅")
+    logger.info("   - Actionable coaching insights ✅")
@@ -26,8 +26,8 @@ logger = logging.getLogger(__name__)
 async def test_redis_vector_integration():
     """Test complete Redis Vector integration."""
     
-    print("🧪 Redis Vector Integration Test")
-    print("=" * 60)
+    logger.info("🧪 Redis Vector Integration Test")
+    logger.info("=" * 60)
     
     test_event_id = "test_event_redis_vector"
     test_results = {
@@ -41,32 +41,32 @@ async def test_redis_vector_integration():
     
     try:
         # Test 1: Health Check
-        print("\n1️⃣ Testing Redis Vector health check...")
+        logger.info("\n1️⃣ Testing Redis Vector health check...")
         health_result = await redis_vector_service.health_check()
         
         if health_result["healthy"]:
-            print(f"✅ Redis Vector healthy: {health_result}")
+            logger.info(f"✅ Redis Vector healthy: {health_result}")
             test_results["health_check"] = True
             
             if not health_result.get("vector_search_available", False):
-                print("⚠️  Warning: Vector search module not detected in Redis")
-                print("   Make sure you're using redis-stack image")
+                logger.warning("⚠️  Warning: Vector search module not detected in Redis")
+                logger.warning("   Make sure you're using redis-stack image")
         else:
-            print(f"❌ Redis Vector unhealthy: {health_result}")
+            logger.error(f"❌ Redis Vector unhealthy: {health_result}")
             return test_results
         
         # Test 2: Index Creation
-        print("\n2️⃣ Testing index creation...")
+        logger.info("\n2️⃣ Testing index creation...")
         try:
             await redis_vector_service.ensure_index_exists(test_event_id, "test_documents")
-            print("✅ Index creation successful")
+            logger.info("✅ Index creation successful")
             test_results["index_creation"] = True
         except Exception as e:
-            print(f"❌ Index creation failed: {e}")
+            logger.error(f"❌ Index creation failed: {e}")
             return test_results
         
         # Test 3: Document Indexing
-        print("\n3️⃣ Testing document indexing...")
+        logger.info("\n3️⃣ Testing document indexing...")
         test_documents = [
             Document(
                 text="This is a test document about AI and machine learning applications in hackathons.",
@@ -85,83 +85,92 @@ async def test_redis_vector_integration():
         indexing_result = await redis_vector_service.index_documents(
             event_id=test_event_id,
             document_type="test_documents",
-            documents=test_documents
+            documents=test_documents,
+            batch_size=32
         )
         
         if indexing_result["success"]:
-            print(f"✅ Document indexing successful: {indexing_result['indexed_count']} documents")
+            assert indexing_result["batched"] is True
+            assert indexing_result["batch_size"] == 32
+            logger.info(f"✅ Document indexing successful: {indexing_result['indexed_count']} documents")
             test_results["document_indexing"] = True
         else:
-            print(f"❌ Document indexing failed: {indexing_result}")
+            logger.error(f"❌ Document indexing failed: {indexing_result}")
             return test_results
         
-        # Test 4: Document Querying
-        print("\n4️⃣ Testing document querying...")
-        query_result = await redis_vector_service.query_index(
-            event_id=test_event_id,
-            document_type="test_documents",
-            query="Tell me about AI and machine learning",
-            top_k=2
+        # Tests 4 and 5 only read the index, so query and list it concurrently
+        query_result, list_result = await asyncio.gather(
+            redis_vector_service.query_index(
+                event_id=test_event_id,
+                document_type="test_documents",
+                query="Tell me about AI and machine learning",
+                top_k=2
+            ),
+            redis_vector_service.list_event_indices(test_event_id)
         )
         
+        # Test 4: Document Querying
+        logger.info("\n4️⃣ Testing document querying...")
         if query_result["success"]:
-            print(f"✅ Document querying successful: {len(query_result['source_nodes'])} results")
-            print(f"   Response: {query_result['response'][:100]}...")
+            logger.info(f"✅ Document querying successful: {len(query_result['source_nodes'])} results")
+            logger.info(f"   Response: {query_result['response'][:100]}...")
             for i, node in enumerate(query_result["source_nodes"]):
-                print(f"   Result {i+1}: Score {node['score']:.3f}, Topic: {node.get('metadata', {}).get('topic', 'unknown')}")
+                logger.info(f"   Result {i+1}: Score {node['score']:.3f}, Topic: {node.get('metadata', {}).get('topic', 'unknown')}")
             test_results["document_querying"] = True
         else:
-            print(f"❌ Document querying failed: {query_result}")
+            logger.error(f"❌ Document querying failed: {query_result}")
             return test_results
         
         # Test 5: Index Listing
-        print("\n5️⃣ Testing index listing...")
-        list_result = await redis_vector_service.list_event_indices(test_event_id)
-        
+        logger.info("\n5️⃣ Testing index listing...")
         if list_result["success"]:
-            print(f"✅ Index listing successful: {len(list_result['indices'])} indices found")
+            logger.info(f"✅ Index listing successful: {len(list_result['indices'])} indices found")
             for idx in list_result["indices"]:
-                print(f"   Index: {idx['document_type']} -> {idx['index_name']}")
+                logger.info(f"   Index: {idx['document_type']} -> {idx['index_name']}")
             test_results["index_listing"] = True
         else:
-            print(f"❌ Index listing failed: {list_result}")
+            logger.error(f"❌ Index listing failed: {list_result}")
         
         # Test 6: Index Cleanup
-        print("\n6️⃣ Testing index cleanup...")
+        logger.info("\n6️⃣ Testing index cleanup...")
         cleanup_result = await redis_vector_service.delete_event_index(
             event_id=test_event_id,
             document_type="test_documents"
         )
         
         if cleanup_result["success"]:
-            print(f"✅ Index cleanup successful: {cleanup_result['deleted_documents']} documents deleted")
+            logger.info(f"✅ Index cleanup successful: {cleanup_result['deleted_documents']} documents deleted")
             test_results["index_cleanup"] = True
         else:
-            print(f"❌ Index cleanup failed: {cleanup_result}")
+            logger.error(f"❌ Index cleanup failed: {cleanup_result}")
         
+    except AssertionError:
+        # Failed checks must reach pytest instead of being logged as a result
+        raise
     except Exception as e:
-        print(f"❌ Integration test failed with exception: {e}")
-        logger.exception("Test failure details:")
+        logger.exception(f"❌ Integration test failed with exception: {e}")
     
     # Summary
-    print("\n📊 Test Results Summary")
-    print("-" * 40)
+    logger.info("\n📊 Test Results Summary")
+    logger.info("-" * 40)
     
     passed_tests = sum(test_results.values())
     total_tests = len(test_results)
     
     for test_name, passed in test_results.items():
-        status = "✅ PASSED" if passed else "❌ FAILED"
-        print(f"{test_name:20s}: {status}")
+        if passed:
+            logger.info(f"{test_name:20s}: ✅ PASSED")
+        else:
+            logger.error(f"{test_name:20s}: ❌ FAILED")
     
-    print(f"\nOverall: {passed_tests}/{total_tests} tests passed")
+    logger.info(f"\nOverall: {passed_tests}/{total_tests} tests passed")
     
     if passed_tests == total_tests:
-        print("\n🎉 All Redis Vector integration tests passed!")
-        print("✅ Ready to replace Qdrant with Redis Vector Search")
+        logger.info("\n🎉 All Redis Vector integration tests passed!")
+        logger.info("✅ Ready to replace Qdrant with Redis Vector Search")
     else:
-        print(f"\n⚠️  {total_tests - passed_tests} test(s) failed")
-        print("❌ Redis Vector integration needs attention before replacing Qdrant")
+        logger.warning(f"\n⚠️  {total_tests - passed_tests} test(s) failed")
+        logger.error("❌ Redis Vector integration needs attention before replacing Qdrant")
     
     return test_results
 
@@ -178,10 +187,10 @@ async def main():
             sys.exit(1)  # Some tests failed
             
     except KeyboardInterrupt:
-        print("\n🛑 Test interrupted by user")
+        logger.info("\n🛑 Test interrupted by user")
         sys.exit(130)
     except Exception as e:
-        print(f"\n💥 Test runner failed: {e}")
+        logger.error(f"\n💥 Test runner failed: {e}")
         sys.exit(1)
 
 
@@ -0,0 +1,91 @@
+"""
+Shared MCP setup for the audio flow test scripts.
+
+test_backend_flow, test_raw_audio and trace_execution each need an event
+and a recording session before they exercise stop_recording. They share a
+pooled HTTP session and a single practice event per process from here.
+"""
+
+import json
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MCP_URL = 'http://localhost:8000/mcp/execute'
+
+_event_id = None
+
+
+def open_mcp_session():
+    """Return a requests.Session whose MCP calls reuse one keep-alive connection."""
+    http = requests.Session()
+    http.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return http
+
+
+def loads_json(content):
+    """Parse a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def post_tool(http, tool, arguments):
+    """POST an MCP tool call and return the raw response.
+
+    The body is encoded with orjson when it is installed, which matters for
+    stop_recording calls that carry large base64 audio strings.
+    """
+    if orjson is None:
+        return http.post(MCP_URL, json={'tool': tool, 'arguments': arguments})
+    return http.post(
+        MCP_URL,
+        data=orjson.dumps({'tool': tool, 'arguments': arguments}),
+        headers={'Content-Type': 'application/json'}
+    )
+
+
+def call_tool(http, tool, arguments):
+    """Execute an MCP tool and return the parsed JSON response."""
+    return loads_json(post_tool(http, tool, arguments).content)
+
+
+def get_test_event(http):
+    """Return the shared practice event id, creating the event on first use."""
+    global _event_id
+    if _event_id is None:
+        event_data = call_tool(http, 'events.create_event', {
+            'event_type': 'individual_practice',
+            'event_name': 'Audio Flow Tests',
+            'description': 'Shared event for the audio flow test scripts',
+            'max_participants': 3,
+            'duration_minutes': 5
+        })
+        if 'error' in event_data:
+            raise RuntimeError(f'Event creation failed: {event_data["error"]}')
+        _event_id = event_data['event_id']
+    return _event_id
+
+
+def start_test_session(http, team_name, pitch_title):
+    """Start a recording session in the shared event.
+
+    Returns (event_id, session_data); errors are reported in session_data
+    the same way the MCP endpoint reports them.
+    """
+    try:
+        event_id = get_test_event(http)
+    except RuntimeError as e:
+        return None, {'error': str(e)}
+
+    session_data = call_tool(http, 'pitches.start_recording', {
+        'event_id': event_id,
+        'team_name': team_name,
+        'pitch_title': pitch_title
+    })
+    return event_id, session_data
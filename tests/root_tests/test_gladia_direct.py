@@ -50,7 +50,7 @@ async def test_gladia_direct():
             
             # Create a more complex audio pattern that mimics speech
             ffmpeg_cmd = [
-                'ffmpeg',
+                'ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error',
                 '-f', 'lavfi',
                 # Create multiple sine waves at speech frequencies
                 '-i', 'anoisesrc=d=3:c=pink:r=16000:a=0.1,highpass=f=80,lowpass=f=3000',
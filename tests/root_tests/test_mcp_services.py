@@ -13,6 +13,7 @@ import json
 import sys
 import os
 import uuid
+from collections import Counter
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
@@ -25,6 +26,31 @@ class MCPTestSuite:
         self.test_results = []
         self.test_event_id = f"test-event-{uuid.uuid4().hex[:8]}"
         self.cleanup_keys = []  # Track keys to clean up
+        self._redis_pool = None
+        self._redis_client = None
+        
+    def get_redis_client(self):
+        """Get the Redis client shared by all test phases."""
+        
+        if self._redis_client is None:
+            import redis.asyncio as redis
+            self._redis_pool = redis.ConnectionPool.from_url(
+                'redis://redis:6379/0',
+                decode_responses=True,
+                max_connections=4,
+                health_check_interval=0
+            )
+            self._redis_client = redis.Redis(connection_pool=self._redis_pool)
+        return self._redis_client
+    
+    async def close_redis(self) -> None:
+        """Close the shared Redis client and its connection pool."""
+        
+        if self._redis_client is not None:
+            await self._redis_client.aclose()
+            await self._redis_pool.aclose()
+            self._redis_client = None
+            self._redis_pool = None
         
     def log_test(self, test_name: str, success: bool, message: str, 
                  details: Optional[Dict] = None) -> None:
@@ -51,8 +77,10 @@ class MCPTestSuite:
         """Set up test data in Redis."""
         
         try:
-            import redis.asyncio as redis
-            client = redis.from_url('redis://redis:6379/0', decode_responses=True)
+            client = self.get_redis_client()
+            
+            # Single baseline so relative timestamps are consistently ordered
+            now = datetime.now()
             
             # Create test sessions with transcripts
             test_sessions = [
@@ -63,7 +91,7 @@ class MCPTestSuite:
                         'total_text': 'This is a test pitch transcript for team Alpha. ' * 20
                     },
                     'event_id': self.test_event_id,
-                    'created_at': (datetime.now() - timedelta(hours=1)).isoformat(),
+                    'created_at': (now - timedelta(hours=1)).isoformat(),
                     'status': 'completed'
                 },
                 {
@@ -73,7 +101,7 @@ class MCPTestSuite:
                         'total_text': 'This is a test pitch transcript for team Beta. ' * 25
                     },
                     'event_id': self.test_event_id,
-                    'created_at': (datetime.now() - timedelta(minutes=30)).isoformat(),
+                    'created_at': (now - timedelta(minutes=30)).isoformat(),
                     'status': 'completed'
                 },
                 {
@@ -83,7 +111,7 @@ class MCPTestSuite:
                         'total_text': 'This is a test pitch transcript for team Gamma. ' * 15
                     },
                     'event_id': self.test_event_id,
-                    'created_at': datetime.now().isoformat(),
+                    'created_at': now.isoformat(),
                     'status': 'recording'  # Still recording
                 }
             ]
@@ -94,7 +122,7 @@ class MCPTestSuite:
                 session_id = f"test-session-{i+1}"
                 session_key = f"event:{self.test_event_id}:session:{session_id}"
                 
-                await client.set(session_key, json.dumps(session_data))
+                await client.set(session_key, json.dumps(session_data, separators=(',', ':')))
                 self.cleanup_keys.append(session_key)
                 session_ids.append(session_id)
             
@@ -107,7 +135,7 @@ class MCPTestSuite:
                         'content': {'score': 88, 'feedback': 'Strong content'},
                         'delivery': {'score': 83, 'feedback': 'Good delivery'}
                     },
-                    'scoring_timestamp': (datetime.now() - timedelta(minutes=45)).isoformat()
+                    'scoring_timestamp': (now - timedelta(minutes=45)).isoformat()
                 },
                 {
                     'session_id': session_ids[1],
@@ -116,17 +144,15 @@ class MCPTestSuite:
                         'content': {'score': 95, 'feedback': 'Excellent innovation'},
                         'delivery': {'score': 89, 'feedback': 'Clear presentation'}
                     },
-                    'scoring_timestamp': (datetime.now() - timedelta(minutes=15)).isoformat()
+                    'scoring_timestamp': (now - timedelta(minutes=15)).isoformat()
                 }
             ]
             
             for score_data in test_scores:
                 scoring_key = f"event:{self.test_event_id}:scoring:{score_data['session_id']}"
-                await client.set(scoring_key, json.dumps(score_data))
+                await client.set(scoring_key, json.dumps(score_data, separators=(',', ':')))
                 self.cleanup_keys.append(scoring_key)
             
-            await client.aclose()
-            
             self.log_test("Setup Test Data", True, 
                          f"Created {len(test_sessions)} sessions and {len(test_scores)} scores")
             return True
@@ -247,8 +273,7 @@ class MCPTestSuite:
         """Test recording status and session management."""
         
         try:
-            import redis.asyncio as redis
-            client = redis.from_url('redis://redis:6379/0', decode_responses=True)
+            client = self.get_redis_client()
             
             # Test 1: Check session status
             session_key = f"event:{self.test_event_id}:session:test-session-1"
@@ -272,18 +297,14 @@ class MCPTestSuite:
                          f"Found {len(session_keys)} sessions for event")
             
             # Test 3: Check for sessions with different statuses
-            status_counts = {}
-            for session_key in session_keys:
-                session_json = await client.get(session_key)
-                if session_json:
-                    session_data = json.loads(session_json)
-                    status = session_data.get('status', 'unknown')
-                    status_counts[status] = status_counts.get(status, 0) + 1
+            session_values = await client.mget(session_keys) if session_keys else []
+            status_counts = Counter(
+                json.loads(session_json).get('status', 'unknown')
+                for session_json in session_values if session_json
+            )
             
             self.log_test("Status Distribution", True,
-                         f"Status counts: {status_counts}")
-            
-            await client.aclose()
+                         f"Status counts: {dict(status_counts)}")
             
         except Exception as e:
             self.log_test("Recording Status Services", False, str(e))
@@ -371,16 +392,13 @@ class MCPTestSuite:
         """Clean up test data from Redis."""
         
         try:
-            import redis.asyncio as redis
-            client = redis.from_url('redis://redis:6379/0', decode_responses=True)
-            
-            deleted_count = 0
-            for key in self.cleanup_keys:
-                if await client.exists(key):
-                    await client.delete(key)
-                    deleted_count += 1
+            client = self.get_redis_client()
             
-            await client.aclose()
+            # DEL is idempotent, so a single variadic call covers missing keys too
+            if self.cleanup_keys:
+                deleted_count = await client.delete(*self.cleanup_keys)
+            else:
+                deleted_count = 0
             
             self.log_test("Cleanup Test Data", True,
                          f"Deleted {deleted_count} test keys")
@@ -426,6 +444,7 @@ async def main():
         print("📋 Phase 1: Setting up test data...")
         if not await tester.setup_test_data():
             print("❌ Test setup failed - cannot continue")
+            await tester.close_redis()
             return
         
         print("\n📋 Phase 2: Testing leaderboard services...")
@@ -445,6 +464,7 @@ async def main():
         
         print("\n📋 Phase 7: Cleaning up...")
         await tester.cleanup_test_data()
+        await tester.close_redis()
         
         # Show final summary
         tester.print_summary()
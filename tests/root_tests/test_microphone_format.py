@@ -73,7 +73,7 @@ async def test_microphone_format():
         ])
         
         # Add some dummy audio-like data
-        dummy_audio = webm_header + b'\x00' * 5000  # 5KB of data
+        dummy_audio = webm_header + bytes(5000)  # 5KB of data
         base64_webm = base64.b64encode(dummy_audio).decode('utf-8')
         
         print(f'   Created {len(dummy_audio)} bytes of WebM-like data')
@@ -5,108 +5,86 @@ Test raw audio recording and transcription to debug Gladia issues.
 
 import asyncio
 import base64
-import requests
 import json
-import sys
 import os
-import tempfile
-import subprocess
+import io
+import wave
+import sys
+from pathlib import Path
+
+import numpy as np
 
-sys.path.insert(0, '/Users/allierays/Sites/pitchscoop/api')
+# Shared helpers live in tests/; make them importable when this script is run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mcp_flow import loads_json, open_mcp_session, post_tool, start_test_session
+
+try:
+    from pybase64 import b64encode_as_string
+except ImportError:
+    def b64encode_as_string(data):
+        return base64.b64encode(data).decode('ascii')
+
+# Send stop_recording audio as a raw request body instead of base64-in-JSON
+USE_RAW_UPLOAD = bool(os.getenv('PS_RAW_UPLOAD'))
+
+def generate_sine_wav(frequency, duration, sample_rate=16000):
+    """Build a 16-bit mono PCM WAV sine tone in memory, without spawning FFmpeg."""
+    t = np.arange(duration * sample_rate) / sample_rate
+    samples = (np.sin(2 * np.pi * frequency * t) * 32767).astype('<i2')
+    
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.tobytes())
+    return buffer.getvalue()
 
 async def test_raw_audio():
+    # One pooled session keeps the MCP calls on a single keep-alive connection
+    with open_mcp_session() as http:
+        await _test_raw_audio(http)
+
+async def _test_raw_audio(http):
     print('🎤 Testing Raw Audio Recording and Transcription')
     print('=' * 50)
     
-    # First, let's create a REAL audio file using FFmpeg to test
-    print('\n1. Creating a real test audio file with speech...')
+    # Synthesize a sine tone in-process; it stands in for speech-like audio
+    print('\n1. Creating a test audio tone...')
     
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-        output_path = tmp_file.name
+    audio_data = generate_sine_wav(frequency=200, duration=3)
+    print(f'✅ Generated test audio: {len(audio_data)} bytes')
     
-    try:
-        # Generate a test audio file with speech synthesis (using FFmpeg's built-in)
-        # This creates a sine wave tone pattern that mimics speech patterns
-        ffmpeg_cmd = [
-            'ffmpeg',
-            '-f', 'lavfi',
-            '-i', 'sine=frequency=200:duration=3',  # 3 second tone
-            '-ar', '16000',  # 16kHz sample rate
-            '-ac', '1',      # Mono
-            '-acodec', 'pcm_s16le',  # 16-bit PCM
-            '-y',
-            output_path
-        ]
-        
-        result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True, timeout=10)
-        
-        if result.returncode != 0:
-            print(f'❌ Failed to generate test audio: {result.stderr}')
-            return
-            
-        # Read the generated audio
-        with open(output_path, 'rb') as f:
-            audio_data = f.read()
-            
-        print(f'✅ Generated test audio: {len(audio_data)} bytes')
-        
-        # Base64 encode for API
-        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-        
-    finally:
-        try:
-            os.unlink(output_path)
-        except:
-            pass
+    # Base64 encode for API
+    audio_base64 = b64encode_as_string(audio_data)
     
     # Create event and session
     print('\n2. Creating event and session...')
     
-    # Create event
-    response = requests.post('http://localhost:8000/mcp/execute', json={
-        'tool': 'events.create_event',
-        'arguments': {
-            'event_type': 'individual_practice',
-            'event_name': 'Raw Audio Test',
-            'description': 'Testing raw audio transcription',
-            'max_participants': 1,
-            'duration_minutes': 5
-        }
-    })
-    event_data = response.json()
-    if 'error' in event_data:
-        print(f'❌ Event creation failed: {event_data["error"]}')
-        return
-    event_id = event_data['event_id']
-    
-    # Start recording session
-    response = requests.post('http://localhost:8000/mcp/execute', json={
-        'tool': 'pitches.start_recording',
-        'arguments': {
-            'event_id': event_id,
-            'team_name': 'Audio Test Team',
-            'pitch_title': 'Raw Audio Test'
-        }
-    })
-    session_data = response.json()
+    event_id, session_data = start_test_session(http, 'Audio Test Team', 'Raw Audio Test')
     if 'error' in session_data:
-        print(f'❌ Session creation failed: {session_data["error"]}')
+        print(f'❌ Setup failed: {session_data["error"]}')
         return
     session_id = session_data['session_id']
     print(f'✅ Session created: {session_id}')
     
     # Test 1: Send as WAV directly
     print('\n3. Testing WAV format (direct)...')
-    response = requests.post('http://localhost:8000/mcp/execute', json={
-        'tool': 'pitches.stop_recording',
-        'arguments': {
+    if USE_RAW_UPLOAD:
+        response = http.post(
+            'http://localhost:8000/mcp/pitches/stop_recording',
+            params={'session_id': session_id, 'audio_format': 'wav'},
+            data=audio_data,
+            headers={'Content-Type': 'application/octet-stream'}
+        )
+    else:
+        response = post_tool(http, 'pitches.stop_recording', {
             'session_id': session_id,
             'audio_data_base64': audio_base64,
             'audio_format': 'wav'
-        }
-    })
+        })
     
-    result = response.json()
+    result = loads_json(response.content)
     print(f'Result: {json.dumps(result, indent=2)}')
     
     # Check transcript
@@ -121,7 +99,7 @@ async def test_raw_audio():
     
     print('\n' + '=' * 50)
     print('🔍 Debug Analysis:')
-    print('1. Generated synthetic audio with FFmpeg')
+    print('1. Generated synthetic sine-tone audio (16kHz, mono, PCM)')
     print('2. Sent as proper WAV format (16kHz, mono, PCM)')
     print('3. Backend processes and sends to Gladia')
     print('4. Result shows if Gladia can transcribe synthetic audio')
@@ -36,9 +36,11 @@ async def test_invalid_api_key_handling():
         # Set an obviously invalid API key
         os.environ['GLADIA_API_KEY'] = 'invalid-key-12345'
         
-        # Mock Redis for the event setup
-        with patch('domains.events.mcp.events_mcp_handler.redis') as mock_redis_module, \
-             patch('domains.recordings.mcp.gladia_mcp_handler.GladiaMCPHandler.get_redis') as mock_get_redis:
+        # Mock Redis for the event setup; the events handler singleton caches its
+        # client, so clear one left behind by an earlier test
+        with patch('api.domains.events.mcp.events_mcp_handler.redis') as mock_redis_module, \
+             patch('api.domains.events.mcp.events_mcp_handler.events_mcp_handler.redis_client', None), \
+             patch('api.domains.recordings.mcp.gladia_mcp_handler.GladiaMCPHandler.get_redis') as mock_get_redis:
             
             mock_redis_client = AsyncMock()
             mock_redis_module.from_url.return_value = mock_redis_client
@@ -69,14 +71,12 @@ async def test_invalid_api_key_handling():
                 "created_at": "2024-01-01T10:00:00Z"
             }
             
-            def mock_redis_get(key):
-                if key == f"event:{event_id}":
-                    return json.dumps(mock_event_data)
-                elif key == f"event:{event_id}:sessions":
-                    return json.dumps([])
-                return None
-                
-            mock_redis_client.get.side_effect = mock_redis_get
+            # Serialize the event and its session list once; every get is a dict lookup
+            _redis_map = {
+                f"event:{event_id}": json.dumps(mock_event_data),
+                f"event:{event_id}:sessions": "[]"
+            }
+            mock_redis_client.get.side_effect = _redis_map.get
             
             # Try to start recording - should fail with API error
             print("Testing with invalid API key...")
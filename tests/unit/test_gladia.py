@@ -6,15 +6,14 @@ Run with: python test_gladia.py
 
 import asyncio
 import json
+import math
+import struct
 import aiohttp
 import websockets
 import os
 import sys
 import pytest
 
-# Add the api directory to the path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 # Configuration
 GLADIA_API_URL = "https://api.gladia.io/v2/live"
 TEST_AUDIO_CONFIG = {
@@ -183,18 +182,17 @@ async def test_with_generated_tone():
                 session_data = await response.json()
                 websocket_url = session_data.get('url')
     
-        # Generate a simple tone
-        import math
-        import struct
-        
+        # Generate a simple tone (16383 is 50% volume to avoid clipping)
         def generate_tone(frequency=440, duration=1.0, sample_rate=16000):
-            samples = []
-            for i in range(int(sample_rate * duration)):
-                t = i / sample_rate
-                # Generate sine wave with lower amplitude to avoid clipping
-                sample = int(16383 * math.sin(2 * math.pi * frequency * t))  # 50% volume
-                samples.append(struct.pack('<h', sample))
-            return b''.join(samples)
+            # Write samples straight into one preallocated buffer
+            n = int(sample_rate * duration)
+            buf = bytearray(2 * n)
+            pack_into = struct.Struct('<h').pack_into
+            sin = math.sin
+            step = 2 * math.pi * frequency / sample_rate  # radians per sample
+            for i in range(n):
+                pack_into(buf, 2 * i, int(16383 * sin(step * i)))
+            return bytes(buf)
         
         tone_audio = generate_tone(440, 2.0)  # 440Hz for 2 seconds
         print(f"Generated {len(tone_audio)} bytes of 440Hz tone")
@@ -0,0 +1,105 @@
+"""
+Test suite for the mcp.batch tool
+
+Tests that batched tool calls:
+- Run in order and resolve "$[i].field" references to earlier results
+- Stop with an error on unresolved or out-of-range references
+- Reject nested batches, oversized batches and non-object results
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from api.main import execute_mcp_tool, MAX_BATCH_CALLS
+
+
+class TestMCPBatch:
+    """Test the mcp.batch tool dispatch in api.main."""
+
+    @pytest.mark.asyncio
+    async def test_batch_resolves_references(self):
+        """Test that later calls receive fields of earlier results."""
+        events = AsyncMock(return_value={"event_id": "event-123"})
+        recordings = AsyncMock(return_value={"session_id": "session-456"})
+
+        with patch("api.main.execute_events_tool", events), \
+             patch("api.main.recordings_execute", recordings):
+            result = await execute_mcp_tool("mcp.batch", {"calls": [
+                {"tool": "events.create_event", "arguments": {"event_name": "Demo"}},
+                {"tool": "pitches.start_recording", "arguments": {
+                    "event_id": "$[0].event_id",
+                    "team_name": "Team"
+                }}
+            ]})
+
+        assert result["completed"] is True
+        assert result["results"] == [{"event_id": "event-123"}, {"session_id": "session-456"}]
+        recordings.assert_awaited_once_with("pitches.start_recording", {
+            "event_id": "event-123",
+            "team_name": "Team"
+        })
+
+    @pytest.mark.asyncio
+    async def test_batch_out_of_range_reference(self):
+        """Test that a reference past the calls already run stops the batch."""
+        recordings = AsyncMock(return_value={"session_id": "session-456"})
+
+        with patch("api.main.recordings_execute", recordings):
+            result = await execute_mcp_tool("mcp.batch", {"calls": [
+                {"tool": "pitches.start_recording", "arguments": {"event_id": "$[1].event_id"}}
+            ]})
+
+        assert result["completed"] is False
+        assert "points past" in result["results"][0]["error"]
+        recordings.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_unresolved_reference(self):
+        """Test that a reference to a missing field stops the batch."""
+        events = AsyncMock(return_value={"event_id": "event-123"})
+        recordings = AsyncMock(return_value={"session_id": "session-456"})
+
+        with patch("api.main.execute_events_tool", events), \
+             patch("api.main.recordings_execute", recordings):
+            result = await execute_mcp_tool("mcp.batch", {"calls": [
+                {"tool": "events.create_event", "arguments": {}},
+                {"tool": "pitches.start_recording", "arguments": {"event_id": "$[0].missing"}}
+            ]})
+
+        assert result["completed"] is False
+        assert len(result["results"]) == 2
+        assert "does not match a field" in result["results"][1]["error"]
+        recordings.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_non_object_result(self):
+        """Test that a non-object tool result is reported as an error."""
+        with patch("api.main.recordings_execute", AsyncMock(return_value=["not", "a", "dict"])):
+            result = await execute_mcp_tool("mcp.batch", {"calls": [
+                {"tool": "pitches.list_sessions", "arguments": {}},
+                {"tool": "pitches.get_session", "arguments": {"session_id": "$[0].session_id"}}
+            ]})
+
+        assert result["completed"] is False
+        assert result["results"] == [{"error": "pitches.list_sessions returned a non-object result"}]
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_nesting(self):
+        """Test that a batch cannot contain another batch."""
+        result = await execute_mcp_tool("mcp.batch", {"calls": [
+            {"tool": "mcp.batch", "arguments": {"calls": []}}
+        ]})
+
+        assert result["completed"] is False
+        assert result["results"] == [{"error": "mcp.batch calls cannot be nested"}]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_limit(self):
+        """Test that oversized batches are rejected before any call runs."""
+        recordings = AsyncMock(return_value={})
+        calls = [{"tool": "pitches.list_sessions", "arguments": {}}] * (MAX_BATCH_CALLS + 1)
+
+        with patch("api.main.recordings_execute", recordings):
+            result = await execute_mcp_tool("mcp.batch", {"calls": calls})
+
+        assert "at most" in result["error"]
+        recordings.assert_not_awaited()
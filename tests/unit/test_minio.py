@@ -3,6 +3,8 @@
 Test MinIO integration for audio storage.
 """
 import asyncio
+import math
+import struct
 import sys
 import os
 from pathlib import Path
@@ -31,18 +33,17 @@ async def test_minio_integration():
     # Generate test audio data
     print("\n🔍 Generating test audio data...")
     def generate_test_audio(duration_seconds=1.0, sample_rate=16000):
-        """Generate test audio data (sine wave)."""
-        import math
-        import struct
+        """Generate test audio data (440Hz sine wave)."""
+        # Write samples straight into one preallocated buffer
+        n = int(sample_rate * duration_seconds)
+        buf = bytearray(2 * n)
+        pack_into = struct.Struct('<h').pack_into
+        sin = math.sin
+        step = 2 * math.pi * 440 / sample_rate  # radians per sample
+        for i in range(n):
+            pack_into(buf, 2 * i, int(16383 * sin(step * i)))
         
-        samples = []
-        for i in range(int(sample_rate * duration_seconds)):
-            t = i / sample_rate
-            # Generate sine wave at 440Hz
-            sample = int(16383 * math.sin(2 * math.pi * 440 * t))
-            samples.append(struct.pack('<h', sample))
-        
-        return b''.join(samples)
+        return bytes(buf)
     
     test_audio = generate_test_audio(duration_seconds=2.0)
     print(f"✅ Generated {len(test_audio)} bytes of test audio")
@@ -0,0 +1,95 @@
+"""
+Test suite for the stop_recording upload paths
+
+Tests that the raw-body endpoint and the base64 MCP call:
+- Hand the same audio bytes to the recording handler
+- Reject empty and oversized raw uploads before the handler runs
+"""
+import base64
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+from api.main import app
+
+# api.main imports the recordings tools as top-level "domains", so patch that module
+HANDLER_TARGET = "domains.recordings.mcp.mcp_tools.gladia_mcp_handler.stop_pitch_recording"
+
+AUDIO_BYTES = b"RIFF\x24\x00\x00\x00WAVEfmt " + bytes(range(64))
+
+
+@pytest.fixture
+def client():
+    """TestClient without lifespan events, so no Redis connection is opened."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def stop_handler():
+    """Replace the Gladia stop handler with a mock that reports success."""
+    handler = AsyncMock(return_value={"session_id": "session-123", "status": "completed"})
+    with patch(HANDLER_TARGET, handler):
+        yield handler
+
+
+class TestStopRecordingUpload:
+    """Test the raw-body and base64 stop_recording paths."""
+
+    def test_raw_body_upload(self, client, stop_handler):
+        """Test that the raw request body reaches the handler unchanged."""
+        response = client.post(
+            "/mcp/pitches/stop_recording",
+            params={"session_id": "session-123", "audio_format": "wav"},
+            content=AUDIO_BYTES,
+            headers={"Content-Type": "application/octet-stream"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+        stop_handler.assert_awaited_once_with(
+            session_id="session-123",
+            audio_data=AUDIO_BYTES,
+            audio_format="wav"
+        )
+
+    def test_base64_upload(self, client, stop_handler):
+        """Test that the base64 MCP call decodes to the same bytes."""
+        response = client.post("/mcp/execute", json={
+            "tool": "pitches.stop_recording",
+            "arguments": {
+                "session_id": "session-123",
+                "audio_data_base64": base64.b64encode(AUDIO_BYTES).decode("ascii"),
+                "audio_format": "wav"
+            }
+        })
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+        stop_handler.assert_awaited_once_with(
+            session_id="session-123",
+            audio_data=AUDIO_BYTES,
+            audio_format="wav"
+        )
+
+    def test_empty_body_rejected(self, client, stop_handler):
+        """Test that an upload without audio never reaches the handler."""
+        response = client.post(
+            "/mcp/pitches/stop_recording",
+            params={"session_id": "session-123"},
+            content=b""
+        )
+
+        assert "empty" in response.json()["error"]
+        stop_handler.assert_not_awaited()
+
+    def test_oversized_body_rejected(self, client, stop_handler):
+        """Test that uploads over MAX_UPLOAD_BYTES are refused."""
+        with patch("api.main.MAX_UPLOAD_BYTES", 16):
+            response = client.post(
+                "/mcp/pitches/stop_recording",
+                params={"session_id": "session-123"},
+                content=AUDIO_BYTES
+            )
+
+        assert "exceeds 16 bytes" in response.json()["error"]
+        stop_handler.assert_not_awaited()
@@ -38,15 +38,18 @@ async def test_gladia_transcription():
     
     # Generate test audio (simple approach)
     def generate_test_audio(duration=2.0, sample_rate=16000):
-        samples = []
-        for i in range(int(sample_rate * duration)):
+        # Write samples straight into one preallocated buffer
+        n = int(sample_rate * duration)
+        buf = bytearray(2 * n)
+        pack_into = struct.Struct('<h').pack_into
+        for i in range(n):
             t = i / sample_rate
             # Simple sine wave at speech frequency
             frequency = 300 + 200 * math.sin(t * 2)  # Varying frequency
             amplitude = 0.3 * (1 + 0.5 * math.sin(t * 8))  # Varying amplitude
             sample = int(16383 * amplitude * math.sin(2 * math.pi * frequency * t))
-            samples.append(struct.pack('<h', sample))
-        return b''.join(samples)
+            pack_into(buf, 2 * i, sample)
+        return bytes(buf)
     
     print('3. Generating test audio...')
     audio_data = generate_test_audio(3.0)